@@ -4,6 +4,7 @@ Data models for requirement handling.
 
 from enum import Enum
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional, Dict, Any
 
 
@@ -45,6 +46,11 @@ class RequirementData:
         if self.dependencies is None:
             self.dependencies = []
 
+    @cached_property
+    def slug(self) -> str:
+        """File-name friendly form of the requirement id."""
+        return self.id.lower().replace(" ", "_")
+
     def mark_implemented(self, generated_code: str = "", test_code: str = ""):
         """Mark requirement as successfully implemented."""
         self.status = RequirementStatus.IMPLEMENTED
@@ -1,11 +1,31 @@
 import csv
 
 
+def iter_requirements_csv(file_path):
+    """
+    Streams a CSV file with columns 'id' and 'description', yielding
+    (id, description) tuples one row at a time.
+    """
+    with open(file_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        try:
+            id_col = header.index("id")
+            desc_col = header.index("description")
+        except ValueError as e:
+            raise KeyError(str(e)) from None
+
+        for row in reader:
+            if row:
+                yield row[id_col], row[desc_col].strip()
+
+
 def read_requirements_csv(file_path):
     """
     Reads a CSV file with columns 'id' and 'description' and returns
     a dict suitable for compare_requirements().
     """
-    with open(file_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        return {row["id"]: row["description"].strip() for row in reader}
+    return dict(iter_requirements_csv(file_path))
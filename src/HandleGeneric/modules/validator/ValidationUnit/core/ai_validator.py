@@ -2,46 +2,166 @@
 AI-powered validation component for logic analysis.
 """
 
+import os
+import re
+import sys
 import time
 import logging
 import json
-from typing import Dict, Any, List, Optional
+import string
+import hashlib
+import threading
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # Optional; token counts are estimated instead
+    tiktoken = None
 
 from ..models.validation_result import ValidationResult, ValidationStatus
-from ..utils.helpers import ValidationHelper
+from ..utils.helpers import ValidationHelper, FILLER_WORDS, dump_json, load_json
 from ..utils.config import ValidationConfig
 
+# Project root, put on sys.path to import the shared AI client
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../.."))
+
+# Shared AI client and the error importing it, resolved once per process
+_ai_client_lock = threading.Lock()
+_ai_client_state: Optional[Tuple[Any, Optional[Exception]]] = None
+
+# Token encoding used to size requests, loaded once per process; None
+# when tiktoken or its encoding data is unavailable
+_token_encoding_lock = threading.Lock()
+_token_encoding_state: Optional[Tuple[Any]] = None
+
+# Context window sizes, in tokens, of the models requests may go to
+_CONTEXT_WINDOWS = {
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+
+# Tokens left free for message framing when sizing a response
+_TOKEN_MARGIN = 256
+
+# System message sent with every analysis request; built once and shared
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You are an expert code reviewer and software architect. "
+        "Analyze the provided code for logic correctness, implementation quality, "
+        "and requirement fulfillment. Respond with valid JSON only."
+    ),
+}
+
+# Placeholders the prompt template may use
+_PROMPT_FIELDS = frozenset({"file_functions", "requirements"})
+
+# Start of a JSON object response, optionally inside a code fence
+_JSON_START_RE = re.compile(r"\s*(?:```(?:json)?\s*)?(?=\{)")
+
+# Words in a plain-text AI response that suggest the code has problems, in
+# the order they are reported
+_NEGATIVE_INDICATORS = (
+    "error",
+    "incorrect",
+    "wrong",
+    "bug",
+    "issue",
+    "problem",
+    "missing",
+    "incomplete",
+    "invalid",
+    "fail",
+)
+
+# Error codes of problems reported by the AI
+_AI_ERROR_CODE = "AI_LOGIC_ERROR"
+_AI_WARNING_CODE = "AI_LOGIC_WARNING"
+
+# Words of four or more characters, split on whitespace, commas and periods
+_KEYWORD_RE = re.compile(r"[^\s,.]{4,}")
+
+
+def _load_ai_client() -> Tuple[Any, Optional[Exception]]:
+    """Import the shared AI client on first use, returning (client, error)."""
+    global _ai_client_state
+
+    with _ai_client_lock:
+        if _ai_client_state is None:
+            try:
+                if _PROJECT_ROOT not in sys.path:
+                    sys.path.insert(0, _PROJECT_ROOT)
+
+                from src.AI.ai import ai_client
+
+                _ai_client_state = (ai_client, None)
+            except Exception as e:
+                _ai_client_state = (None, e)
+
+        return _ai_client_state
+
+
+def _token_encoding() -> Optional[Any]:
+    """Load the tiktoken encoding on first use, or None if unavailable."""
+    global _token_encoding_state
+
+    with _token_encoding_lock:
+        if _token_encoding_state is None:
+            encoding = None
+            if tiktoken is not None:
+                try:
+                    encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    encoding = None
+            _token_encoding_state = (encoding,)
+
+        return _token_encoding_state[0]
+
 
 class AIValidator:
     """AI-powered validator for logic analysis."""
 
+    # Model used for the analysis requests
+    AI_MODEL = "gpt-4"
+
+    # Maximum number of AI responses kept in memory, keyed by request hash
+    RESPONSE_CACHE_SIZE = 256
+    # Bumped when what is cached for a response changes, so older entries are
+    # not reused; 2 stores only the JSON object of a streamed response
+    RESPONSE_CACHE_VERSION = 2
+
     def __init__(self, config: ValidationConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.ai_client = None
+
+        # LRU cache of response texts, backed by one JSON file per request
+        self._response_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._response_cache_dir = Path(config.ai_cache_dir).expanduser()
+        self._cache_lock = threading.Lock()
+
+        # Prompt template split into literal text and placeholder names,
+        # re-split only when the configured template changes
+        self._prompt_template: Optional[str] = None
+        self._prompt_segments: Optional[Tuple[Tuple[str, Optional[str]], ...]] = None
+
         self._initialize_ai_client()
 
     def _initialize_ai_client(self):
         """Initialize AI client if available."""
-        try:
-            # Try to import and initialize the existing AI system
-            import sys
-            import os
-
-            # Add the project root to path to import ai module
-            project_root = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), "../../../..")
-            )
-            if project_root not in sys.path:
-                sys.path.insert(0, project_root)
-
-            from src.AI.ai import ai_client
+        # The existing AI system is imported once and shared by all validators
+        ai_client, error = _load_ai_client()
 
+        if error is None:
             self.ai_client = ai_client
             self.logger.info("AI client initialized successfully")
-
-        except Exception as e:
-            self.logger.warning(f"Could not initialize AI client: {e}")
+        else:
+            self.logger.warning("Could not initialize AI client: %s", error)
             self.ai_client = None
 
     def validate(
@@ -111,7 +231,7 @@ class AIValidator:
         except Exception as e:
             result.add_error(f"AI validation failed: {str(e)}")
             result.status = ValidationStatus.ERROR
-            self.logger.error(f"AI validation error: {e}")
+            self.logger.error("AI validation error: %s", e)
 
         finally:
             result.execution_time = time.time() - start_time
@@ -122,32 +242,30 @@ class AIValidator:
         self, codebase_path: str, metadata: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Prepare data for AI analysis."""
-        # Create file and function summary
-        file_functions = ValidationHelper.create_file_function_summary(metadata)
+        # Create file and function summary, counting functions and classes
+        file_functions, functions_count, classes_count = (
+            ValidationHelper.create_summary_and_counts(metadata)
+        )
+        if file_functions and self.config.enable_prompt_compression:
+            compressed = ValidationHelper.compress_file_functions(file_functions)
 
-        # Get requirements if available
-        requirements_path = f"{codebase_path.rstrip('/')}/requirements.csv"
-        if not requirements_path.endswith("/requirements.csv"):
-            # Look for requirements in parent directories
-            import os
-
-            parent_dir = os.path.dirname(codebase_path)
-            requirements_path = os.path.join(
-                parent_dir, "enviroment", "requirements.csv"
+            # Keep the original unless compression saves enough to be worth it
+            max_length = len(file_functions) * (
+                1 - self.config.prompt_compression_min_savings
             )
+            if len(compressed) <= max_length:
+                file_functions = compressed
 
-        requirements = ValidationHelper.extract_requirements_from_csv(requirements_path)
-
-        # Count functions and classes
-        functions_count = 0
-        classes_count = 0
-
-        for file_data in metadata.get("files", []):
-            functions_count += len(file_data.get("functions", []))
-            classes_count += len(file_data.get("classes", []))
-
-            for cls in file_data.get("classes", []):
-                functions_count += len(cls.get("methods", []))
+        # Get requirements if available
+        base_path = Path(codebase_path)
+        requirements_path = base_path / "requirements.csv"
+        if not requirements_path.is_file():
+            # Look for requirements next to the codebase
+            requirements_path = base_path.parent / "enviroment" / "requirements.csv"
+
+        requirements = ValidationHelper.extract_requirements_from_csv(
+            str(requirements_path)
+        )
 
         return {
             "file_functions": file_functions,
@@ -167,52 +285,34 @@ class AIValidator:
             requirements_text = ""
             if analysis_data["requirements"]:
                 requirements_text = "\n".join(
-                    [
-                        f"- {req.get('id', '')}: {req.get('description', '')}"
-                        for req in analysis_data["requirements"]
-                    ]
+                    f"- {req.get('id', '')}: {req.get('description', '')}"
+                    for req in analysis_data["requirements"]
                 )
             else:
                 requirements_text = "No specific requirements provided. Please analyze general code quality and logic."
 
             # Create the analysis prompt
-            prompt = self.config.ai_validation_prompt_template.format(
+            prompt = self._render_prompt(
                 file_functions=analysis_data["file_functions"],
                 requirements=requirements_text,
             )
 
-            # Call AI client
-            self.logger.debug("Sending request to AI client")
-
-            response = self.ai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are an expert code reviewer and software architect. "
-                            "Analyze the provided code for logic correctness, implementation quality, "
-                            "and requirement fulfillment. Respond with valid JSON only."
-                        ),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=self.config.ai_max_tokens,
-                temperature=self.config.ai_temperature,
-            )
-
-            ai_response_text = response.choices[0].message.content.strip()
-            self.logger.debug(f"AI response length: {len(ai_response_text)}")
+            ai_response_text = self._request_analysis(prompt)
+            self.logger.debug("AI response length: %d", len(ai_response_text))
 
             # Try to parse JSON response
             try:
-                # Clean up response if needed
-                if ai_response_text.startswith("```json"):
-                    ai_response_text = ai_response_text[7:]
-                if ai_response_text.endswith("```"):
-                    ai_response_text = ai_response_text[:-3]
-
-                ai_response = json.loads(ai_response_text.strip())
+                # Clean up response if needed, cutting any code fence in one copy
+                start = 0
+                end = len(ai_response_text)
+                if ai_response_text.startswith("```"):
+                    start = 7 if ai_response_text.startswith("```json") else 3
+                if ai_response_text.endswith("```") and end - 3 >= start:
+                    end -= 3
+                if start or end < len(ai_response_text):
+                    ai_response_text = ai_response_text[start:end]
+
+                ai_response = load_json(ai_response_text)
                 return ai_response
 
             except json.JSONDecodeError as e:
@@ -221,32 +321,224 @@ class AIValidator:
                 return self._parse_text_response(ai_response_text)
 
         except Exception as e:
-            self.logger.error(f"Error calling AI client: {e}")
+            self.logger.error("Error calling AI client: %s", e)
             result.add_warning(f"AI analysis failed: {str(e)}")
             return None
 
+    def _request_analysis(self, prompt: str) -> str:
+        """Send the prompt to the AI client, reusing a cached response if any."""
+        model, max_tokens = self._plan_request(prompt)
+
+        if not self.config.ai_cache_enabled:
+            return self._call_ai_client(prompt, model, max_tokens)
+
+        key = self._response_cache_key(prompt, model, max_tokens)
+        cached = self._cached_response(key)
+        if cached is not None:
+            self.logger.debug("Reusing cached AI response")
+            return cached
+
+        response_text = self._call_ai_client(prompt, model, max_tokens)
+        self._store_response(key, response_text)
+        return response_text
+
+    def _plan_request(self, prompt: str) -> Tuple[str, int]:
+        """
+        Choose the model and response token limit for a prompt.
+
+        Small prompts go to the cheaper model when one is configured, and the
+        response limit is lowered so that prompt and response fit the model's
+        context window.
+        """
+        prompt_tokens = self._count_tokens(_SYSTEM_MESSAGE["content"] + prompt)
+
+        model = self.AI_MODEL
+        if (
+            self.config.ai_cheap_model
+            and prompt_tokens < self.config.ai_cheap_model_threshold
+        ):
+            model = self.config.ai_cheap_model
+
+        max_tokens = self.config.ai_max_tokens
+        context_window = _CONTEXT_WINDOWS.get(model)
+        if context_window is not None:
+            available = context_window - prompt_tokens - _TOKEN_MARGIN
+            max_tokens = max(1, min(max_tokens, available))
+
+        return model, max_tokens
+
+    @staticmethod
+    def _count_tokens(text: str) -> int:
+        """Count tokens with tiktoken when available, else estimate them."""
+        encoding = _token_encoding()
+        if encoding is None:
+            # Roughly four characters per token for English text and code
+            return len(text) // 4 + 1
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def _call_ai_client(self, prompt: str, model: str, max_tokens: int) -> str:
+        """Send the prompt to the AI client and return the response text."""
+        self.logger.debug("Sending request to AI client (model %s)", model)
+
+        response = self.ai_client.chat.completions.create(
+            model=model,
+            messages=[_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=self.config.ai_temperature,
+            stream=self.config.ai_stream_responses,
+        )
+
+        if self.config.ai_stream_responses:
+            return self._read_streamed_response(response)
+        return response.choices[0].message.content.strip()
+
+    @staticmethod
+    def _read_streamed_response(stream) -> str:
+        """
+        Collect a streamed response, stopping once a JSON object is complete.
+
+        Whatever the model would generate after the object, such as a closing
+        code fence or commentary, is not waited for, and any part of it that
+        arrived in the same chunk is dropped: only the object is returned.
+        """
+        decoder = json.JSONDecoder()
+        parts = []
+
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+
+                # Only a closing brace can complete the object
+                if "}" not in delta:
+                    continue
+                text = "".join(parts)
+                match = _JSON_START_RE.match(text)
+                if match is None:
+                    continue
+                try:
+                    _, end_index = decoder.raw_decode(text, match.end())
+                except ValueError:
+                    continue
+                return text[match.end() : end_index]
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+        return "".join(parts).strip()
+
+    def _response_cache_key(self, prompt: str, model: str, max_tokens: int) -> str:
+        """
+        Hash everything that determines the AI response.
+
+        Whitespace in the prompt is normalized, so prompts differing only in
+        layout share a response.
+        """
+        request = json.dumps(
+            [
+                self.RESPONSE_CACHE_VERSION,
+                model,
+                self.config.ai_temperature,
+                max_tokens,
+                _SYSTEM_MESSAGE["content"],
+                " ".join(prompt.split()),
+            ]
+        )
+        return hashlib.blake2b(request.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _cached_response(self, key: str) -> Optional[str]:
+        """Return a cached response that has not expired, or None."""
+        with self._cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is not None:
+                self._response_cache.move_to_end(key)
+
+        if entry is None:
+            try:
+                with open(self._response_cache_dir / f"{key}.json", "rb") as f:
+                    stored = load_json(f.read())
+                entry = (float(stored["created"]), str(stored["response"]))
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+            self._remember_response(key, entry)
+
+        created, response_text = entry
+        if time.time() - created > self.config.ai_cache_ttl_seconds:
+            return None
+        return response_text
+
+    def _store_response(self, key: str, response_text: str):
+        """Cache a response; failures only cost a later run another request."""
+        entry = (time.time(), response_text)
+        self._remember_response(key, entry)
+
+        cache_file = self._response_cache_dir / f"{key}.json"
+        temp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            self._response_cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, "wb") as f:
+                f.write(dump_json({"created": entry[0], "response": response_text}))
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            self.logger.debug("Could not write AI response cache: %s", e)
+
+    def _remember_response(self, key: str, entry: Tuple[float, str]):
+        """Keep a response in the in-memory cache, evicting the oldest."""
+        with self._cache_lock:
+            self._response_cache[key] = entry
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _render_prompt(self, **values: str) -> str:
+        """Fill the configured prompt template with the given values."""
+        template = self.config.ai_validation_prompt_template
+        if template is not self._prompt_template:
+            self._prompt_segments = self._split_prompt_template(template)
+            self._prompt_template = template
+
+        # Templates using format specs or other fields go through str.format
+        if self._prompt_segments is None:
+            return template.format(**values)
+
+        parts = []
+        for literal, name in self._prompt_segments:
+            parts.append(literal)
+            if name is not None:
+                parts.append(values[name])
+        return "".join(parts)
+
+    @staticmethod
+    def _split_prompt_template(
+        template: str,
+    ) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+        """
+        Split a format template into (literal, placeholder) pairs.
+
+        Returns None if the template needs more than plain substitution of
+        the known placeholders.
+        """
+        segments = []
+        for literal, name, spec, conversion in string.Formatter().parse(template):
+            if name is not None and (name not in _PROMPT_FIELDS or spec or conversion):
+                return None
+            segments.append((literal, name))
+        return tuple(segments)
+
     def _parse_text_response(self, text_response: str) -> Dict[str, Any]:
         """Parse text response when JSON parsing fails."""
         # Basic text analysis to extract insights
         response = {"valid": True, "problems": [], "suggestions": []}
 
         # Look for negative indicators
-        negative_indicators = [
-            "error",
-            "incorrect",
-            "wrong",
-            "bug",
-            "issue",
-            "problem",
-            "missing",
-            "incomplete",
-            "invalid",
-            "fail",
-        ]
-
         text_lower = text_response.lower()
 
-        for indicator in negative_indicators:
+        for indicator in _NEGATIVE_INDICATORS:
             if indicator in text_lower:
                 response["valid"] = False
                 response["problems"].append(
@@ -280,21 +572,26 @@ class AIValidator:
             for problem in problems:
                 if isinstance(problem, str):
                     result.add_error(
-                        f"AI detected issue: {problem}", error_code="AI_LOGIC_ERROR"
+                        f"AI detected issue: {problem}", error_code=_AI_ERROR_CODE
                     )
                 elif isinstance(problem, dict):
                     problem_msg = problem.get("description", str(problem))
-                    severity = problem.get("severity", "error").lower()
+
+                    # Most severities already arrive as "error"; only others
+                    # need normalizing
+                    severity = problem.get("severity", "error")
+                    if severity != "error":
+                        severity = severity.lower()
 
                     if severity == "error":
                         result.add_error(
                             f"AI detected issue: {problem_msg}",
-                            error_code="AI_LOGIC_ERROR",
+                            error_code=_AI_ERROR_CODE,
                         )
                     else:
                         result.add_warning(
                             f"AI detected concern: {problem_msg}",
-                            error_code="AI_LOGIC_WARNING",
+                            error_code=_AI_WARNING_CODE,
                         )
 
             # Process suggestions
@@ -317,60 +614,18 @@ class AIValidator:
                 result.metadata["ai_raw_response"] = ai_response["raw_response"]
 
             self.logger.info(
-                f"AI analysis completed - Valid: {is_valid}, Problems: {len(problems)}, Suggestions: {len(suggestions)}"
+                "AI analysis completed - Valid: %s, Problems: %d, Suggestions: %d",
+                is_valid,
+                len(problems),
+                len(suggestions),
             )
 
         except Exception as e:
             result.add_warning(f"Error processing AI response: {str(e)}")
-            self.logger.error(f"Error processing AI response: {e}")
+            self.logger.error("Error processing AI response: %s", e)
 
     def _extract_keywords(self, requirement_text: str) -> List[str]:
         """Extract key words from requirement text."""
-        # Simple keyword extraction
-        common_words = {
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "will",
-            "would",
-            "could",
-            "should",
-            "may",
-            "might",
-            "can",
-            "must",
-            "shall",
-        }
-
-        words = requirement_text.replace(",", " ").replace(".", " ").split()
-        keywords = []
-
-        for word in words:
-            word = word.strip().lower()
-            if len(word) > 3 and word not in common_words:
-                keywords.append(word)
-
-        return keywords[:5]  # Limit to top 5 keywords
+        # Simple keyword extraction, stopping at the first five keywords
+        words = (m.group().lower() for m in _KEYWORD_RE.finditer(requirement_text))
+        return list(islice((w for w in words if w not in FILLER_WORDS), 5))
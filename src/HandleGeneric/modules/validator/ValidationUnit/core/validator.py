@@ -3,8 +3,10 @@ Main validator orchestrator that coordinates all validation steps.
 """
 
 import os
+import stat
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
 from ..models.validation_result import (
@@ -22,19 +24,25 @@ from .ai_validator import AIValidator
 class CodebaseValidator:
     """Main validator that orchestrates all validation steps."""
 
-    def __init__(self, config: Optional[ValidationConfig] = None):
+    def __init__(
+        self,
+        config: Optional[ValidationConfig] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initialize the validator; with a logger, logging setup is left to the caller."""
         self.config = config or ValidationConfig()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger or logging.getLogger(__name__)
 
         # Initialize validators
         self.syntax_validator = SyntaxValidator(self.config)
         self.test_validator = TestValidator(self.config)
         self.ai_validator = AIValidator(self.config)
 
-        # Setup logging
-        ValidationHelper.setup_logging(
-            self.config.log_level, self.config.verbose_output
-        )
+        # Setup logging, unless embedded by a caller with its own
+        if logger is None:
+            ValidationHelper.setup_logging(
+                self.config.log_level, self.config.verbose_output
+            )
 
         self.logger.info("CodebaseValidator initialized")
 
@@ -129,17 +137,23 @@ class CodebaseValidator:
         """Validate input paths and configuration."""
         errors = []
 
-        # Check codebase path
-        if not os.path.exists(codebase_path):
+        # Check codebase path (one stat per path)
+        try:
+            codebase_stat = os.stat(codebase_path)
+        except (OSError, ValueError):
             errors.append(f"Codebase path does not exist: {codebase_path}")
-        elif not os.path.isdir(codebase_path):
-            errors.append(f"Codebase path is not a directory: {codebase_path}")
+        else:
+            if not stat.S_ISDIR(codebase_stat.st_mode):
+                errors.append(f"Codebase path is not a directory: {codebase_path}")
 
         # Check metadata path
-        if not os.path.exists(metadata_path):
+        try:
+            metadata_stat = os.stat(metadata_path)
+        except (OSError, ValueError):
             errors.append(f"Metadata file does not exist: {metadata_path}")
-        elif not os.path.isfile(metadata_path):
-            errors.append(f"Metadata path is not a file: {metadata_path}")
+        else:
+            if not stat.S_ISREG(metadata_stat.st_mode):
+                errors.append(f"Metadata path is not a file: {metadata_path}")
 
         # Validate configuration
         config_errors = self.config.validate()
@@ -154,65 +168,86 @@ class CodebaseValidator:
         overall_result: OverallValidationResult,
     ):
         """Run all enabled validation steps."""
-
-        # Step 1: Syntax Validation
-        if self.config.enable_syntax_validation:
-            try:
-                self.logger.info("Running syntax validation...")
-                syntax_result = self.syntax_validator.validate(codebase_path, metadata)
-                overall_result.add_step_result(syntax_result)
-
-                if not syntax_result.is_valid and self.config.stop_on_first_failure:
-                    self.logger.warning("Stopping validation due to syntax errors")
+        steps = [
+            (step_name, short_name, validator, stop_reason)
+            for enabled, step_name, short_name, validator, stop_reason in (
+                (
+                    self.config.enable_syntax_validation,
+                    "Syntax Validation",
+                    "Syntax",
+                    self.syntax_validator,
+                    "syntax errors",
+                ),
+                (
+                    self.config.enable_test_validation,
+                    "Test Validation",
+                    "Test",
+                    self.test_validator,
+                    "test failures",
+                ),
+                (
+                    self.config.enable_ai_validation,
+                    "AI Logic Validation",
+                    "AI",
+                    self.ai_validator,
+                    None,
+                ),
+            )
+            if enabled
+        ]
+
+        if self.config.stop_on_first_failure or len(steps) < 2:
+            for step_name, short_name, validator, stop_reason in steps:
+                try:
+                    self.logger.info(f"Running {step_name}...")
+                    step_result = validator.validate(codebase_path, metadata)
+                except Exception as e:
+                    overall_result.add_step_result(
+                        self._step_error_result(step_name, short_name, e)
+                    )
+                    continue
+
+                overall_result.add_step_result(step_result)
+
+                if (
+                    stop_reason
+                    and not step_result.is_valid
+                    and self.config.stop_on_first_failure
+                ):
+                    self.logger.warning(f"Stopping validation due to {stop_reason}")
                     return
-
-            except Exception as e:
-                self.logger.error(f"Syntax validation failed: {e}")
-                error_result = ValidationResult(
-                    step_name="Syntax Validation",
-                    status=ValidationStatus.ERROR,
-                    is_valid=False,
+            return
+
+        # Without early stopping the steps are independent, and each mostly
+        # waits on files, pytest or the AI service, so they run side by side.
+        # Results are still added in step order.
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            futures = []
+            for step_name, _, validator, _ in steps:
+                self.logger.info(f"Running {step_name}...")
+                futures.append(
+                    executor.submit(validator.validate, codebase_path, metadata)
                 )
-                error_result.add_error(f"Syntax validation error: {str(e)}")
-                overall_result.add_step_result(error_result)
 
-        # Step 2: Test Validation
-        if self.config.enable_test_validation:
+        for (step_name, short_name, _, _), future in zip(steps, futures):
             try:
-                self.logger.info("Running test validation...")
-                test_result = self.test_validator.validate(codebase_path, metadata)
-                overall_result.add_step_result(test_result)
-
-                if not test_result.is_valid and self.config.stop_on_first_failure:
-                    self.logger.warning("Stopping validation due to test failures")
-                    return
-
+                step_result = future.result()
             except Exception as e:
-                self.logger.error(f"Test validation failed: {e}")
-                error_result = ValidationResult(
-                    step_name="Test Validation",
-                    status=ValidationStatus.ERROR,
-                    is_valid=False,
-                )
-                error_result.add_error(f"Test validation error: {str(e)}")
-                overall_result.add_step_result(error_result)
-
-        # Step 3: AI Logic Validation
-        if self.config.enable_ai_validation:
-            try:
-                self.logger.info("Running AI logic validation...")
-                ai_result = self.ai_validator.validate(codebase_path, metadata)
-                overall_result.add_step_result(ai_result)
+                step_result = self._step_error_result(step_name, short_name, e)
+            overall_result.add_step_result(step_result)
 
-            except Exception as e:
-                self.logger.error(f"AI validation failed: {e}")
-                error_result = ValidationResult(
-                    step_name="AI Logic Validation",
-                    status=ValidationStatus.ERROR,
-                    is_valid=False,
-                )
-                error_result.add_error(f"AI validation error: {str(e)}")
-                overall_result.add_step_result(error_result)
+    def _step_error_result(
+        self, step_name: str, short_name: str, error: Exception
+    ) -> ValidationResult:
+        """Build the result for a validation step that raised."""
+        self.logger.error(f"{short_name} validation failed: {error}")
+        error_result = ValidationResult(
+            step_name=step_name,
+            status=ValidationStatus.ERROR,
+            is_valid=False,
+        )
+        error_result.add_error(f"{short_name} validation error: {str(error)}")
+        return error_result
 
     def _save_validation_report(
         self, overall_result: OverallValidationResult, output_path: str
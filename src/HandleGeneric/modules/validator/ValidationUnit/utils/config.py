@@ -3,9 +3,15 @@ Configuration management for the validation system.
 """
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Dict, Any, Optional
 
+# Per-user directory the validation caches are kept in by default
+_USER_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "ValidationUnit",
+)
+
 
 @dataclass
 class ValidationConfig:
@@ -21,6 +27,8 @@ class ValidationConfig:
     syntax_check_imports: bool = True
     syntax_check_indentation: bool = True
     syntax_python_version: str = "3.7"
+    syntax_cache_enabled: bool = True  # skip re-parsing unchanged valid files
+    syntax_cache_path: str = os.path.join(_USER_CACHE_DIR, "syntax.json")
 
     # Test validation settings
     test_timeout: int = 300  # seconds
@@ -56,6 +64,14 @@ Return a JSON response with:
 
     ai_max_tokens: int = 2000
     ai_temperature: float = 0.1
+    ai_cheap_model: str = ""  # e.g. "gpt-4o-mini"; empty always uses gpt-4
+    ai_cheap_model_threshold: int = 2000  # prompt tokens below which it is used
+    ai_stream_responses: bool = True
+    ai_cache_enabled: bool = True
+    ai_cache_dir: str = os.path.join(_USER_CACHE_DIR, "ai_responses")
+    ai_cache_ttl_seconds: int = 7 * 24 * 60 * 60
+    enable_prompt_compression: bool = True
+    prompt_compression_min_savings: float = 0.1  # 0-1, else send uncompressed
 
     # Output settings
     output_format: str = "json"  # json, yaml, text
@@ -82,6 +98,15 @@ Return a JSON response with:
         if self.ai_temperature < 0 or self.ai_temperature > 2:
             errors.append("AI temperature must be between 0 and 2")
 
+        if self.ai_cheap_model_threshold < 0:
+            errors.append("AI cheap model threshold must not be negative")
+
+        if self.ai_cache_ttl_seconds < 0:
+            errors.append("AI cache TTL must not be negative")
+
+        if not 0 <= self.prompt_compression_min_savings < 1:
+            errors.append("Prompt compression savings must be between 0 and 1")
+
         if self.output_format not in ["json", "yaml", "text"]:
             errors.append("Output format must be json, yaml, or text")
 
@@ -93,26 +118,23 @@ Return a JSON response with:
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> "ValidationConfig":
         """Create config from dictionary."""
-        return cls(**{k: v for k, v in config_dict.items() if hasattr(cls, k)})
+        return cls(**{k: v for k, v in config_dict.items() if k in _FIELD_NAME_SET})
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
-            field.name: getattr(self, field.name)
-            for field in self.__dataclass_fields__.values()
-        }
+        return {name: getattr(self, name) for name in _FIELD_NAMES}
 
     @classmethod
     def from_file(cls, config_path: str) -> "ValidationConfig":
         """Load configuration from file."""
-        import json
+        from .helpers import load_json
 
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
         with open(config_path, "r", encoding="utf-8") as f:
             if config_path.endswith(".json"):
-                config_dict = json.load(f)
+                config_dict = load_json(f.read())
             elif config_path.endswith((".yml", ".yaml")):
                 try:
                     import yaml
@@ -127,14 +149,17 @@ Return a JSON response with:
 
     def save_to_file(self, config_path: str):
         """Save configuration to file."""
-        import json
+        from .helpers import dump_json
 
         os.makedirs(os.path.dirname(config_path), exist_ok=True)
 
+        if config_path.endswith(".json"):
+            with open(config_path, "wb") as f:
+                f.write(dump_json(self.to_dict(), indent=True))
+            return
+
         with open(config_path, "w", encoding="utf-8") as f:
-            if config_path.endswith(".json"):
-                json.dump(self.to_dict(), f, indent=2)
-            elif config_path.endswith((".yml", ".yaml")):
+            if config_path.endswith((".yml", ".yaml")):
                 try:
                     import yaml
 
@@ -143,3 +168,8 @@ Return a JSON response with:
                     raise ImportError("PyYAML is required for YAML config files")
             else:
                 raise ValueError("Config file must be JSON or YAML")
+
+
+# Configuration field names, in declaration order
+_FIELD_NAMES = tuple(f.name for f in fields(ValidationConfig))
+_FIELD_NAME_SET = frozenset(_FIELD_NAMES)
@@ -3,23 +3,190 @@ Helper utilities for the validation system.
 """
 
 import os
+import re
+import sys
 import json
 import subprocess
 import fnmatch
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Pattern, Tuple, Union
 import logging
 
+try:
+    import orjson
+except ImportError:  # Optional; the json module is used instead
+    orjson = None
+
+# Common English words that carry little meaning in keywords and prompts
+FILLER_WORDS = frozenset(
+    {
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "in",
+        "on",
+        "at",
+        "to",
+        "for",
+        "of",
+        "with",
+        "by",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "have",
+        "has",
+        "had",
+        "do",
+        "does",
+        "did",
+        "will",
+        "would",
+        "could",
+        "should",
+        "may",
+        "might",
+        "can",
+        "must",
+        "shall",
+    }
+)
+
+# Labels used by create_file_function_summary, shortened in compressed prompts
+_SUMMARY_LABELS = {
+    "File": "F",
+    "Function": "f",
+    "Class": "c",
+    "Method": "m",
+    "Description": "d",
+}
+_SUMMARY_LINE_RE = re.compile(r"^\s*(File|Function|Class|Method|Description): ?(.*)$")
+_SUMMARY_LEGEND = "(F=file f=function c=class m=method d=description)"
+
+# Paths left out of get_python_files unless other patterns are given
+DEFAULT_EXCLUDE_PATTERNS = (
+    "__pycache__/*",
+    "*.pyc",
+    ".git/*",
+    ".pytest_cache/*",
+    "htmlcov/*",
+    ".coverage*",
+    "build/*",
+    "dist/*",
+    "*.egg-info/*",
+)
+
+
+# Syntax that compiles depends on the interpreter, so cached passes do too
+_PYTHON_VERSION = "%d.%d" % sys.version_info[:2]
+
+
+@functools.lru_cache(maxsize=64)
+def _pattern_regex(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+    """Compile fnmatch patterns into one regex matching any of them."""
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(
+            f"(?:{fnmatch.translate(os.path.normcase(pattern))})"
+            for pattern in patterns
+        )
+    )
+
+
+def _file_stamp(file_path: str) -> Optional[List[int]]:
+    """Return [mtime_ns, size] identifying a file's current contents."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _scan_files(
+    base_path: str, exclude_re: Optional[Pattern] = None
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (path, relative path) for every file under base_path.
+
+    Entries are visited top-down in os.walk order. Excluded directories are
+    not descended into and symlinked directories are not followed. Paths
+    are joined as pathlib would, so a base of "." adds no "./" prefix.
+    """
+    base_prefix = "" if base_path == os.curdir else os.path.join(base_path, "")
+    stack = [""]
+    while stack:
+        prefix = stack.pop()
+        try:
+            with os.scandir(base_prefix + prefix or base_path) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            relative = prefix + entry.name
+            if exclude_re is not None and exclude_re.match(os.path.normcase(relative)):
+                continue
+
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if not is_dir:
+                yield base_prefix + relative, relative
+            elif not entry.is_symlink():
+                subdirs.append(relative + os.sep)
+
+        stack.extend(reversed(subdirs))
+
+
+def load_json(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    text = json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+    return text.encode("utf-8")
+
 
 class ValidationHelper:
     """Helper class for validation operations."""
 
+    # Files needed before syntax checks run in worker processes
+    PARALLEL_SYNTAX_THRESHOLD = 32
+    # Files handed to a worker at a time
+    SYNTAX_CHUNK_SIZE = 16
+    # Bumped when what a cached pass means changes, so older caches are
+    # ignored; 2 records passes of a full compile rather than a parse
+    SYNTAX_CACHE_VERSION = 2
+    # Passing files kept in the syntax cache; the least recently checked go first
+    SYNTAX_CACHE_SIZE = 4096
+
     @staticmethod
     def load_metadata(metadata_path: str) -> Dict[str, Any]:
         """Load metadata from JSON file."""
         try:
-            with open(metadata_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(metadata_path, "rb") as f:
+                return load_json(f.read())
         except FileNotFoundError:
             raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
         except json.JSONDecodeError as e:
@@ -31,56 +198,29 @@ class ValidationHelper:
     ) -> List[str]:
         """Get all Python files in the codebase."""
         if exclude_patterns is None:
-            exclude_patterns = [
-                "__pycache__/*",
-                "*.pyc",
-                ".git/*",
-                ".pytest_cache/*",
-                "htmlcov/*",
-                ".coverage*",
-                "build/*",
-                "dist/*",
-                "*.egg-info/*",
-            ]
-
-        python_files = []
-        codebase_path = Path(codebase_path)
-
-        for root, dirs, files in os.walk(codebase_path):
-            # Remove excluded directories
-            dirs[:] = [
-                d
-                for d in dirs
-                if not ValidationHelper._is_excluded(
-                    Path(root) / d, codebase_path, exclude_patterns
-                )
-            ]
+            exclude_patterns = DEFAULT_EXCLUDE_PATTERNS
 
-            for file in files:
-                if file.endswith(".py"):
-                    file_path = Path(root) / file
-                    if not ValidationHelper._is_excluded(
-                        file_path, codebase_path, exclude_patterns
-                    ):
-                        python_files.append(str(file_path))
-
-        return python_files
+        exclude_re = _pattern_regex(tuple(exclude_patterns))
+        return [
+            file_path
+            for file_path, _ in _scan_files(str(Path(codebase_path)), exclude_re)
+            if file_path.endswith(".py")
+        ]
 
     @staticmethod
     def _is_excluded(
         file_path: Path, base_path: Path, exclude_patterns: List[str]
     ) -> bool:
         """Check if a file should be excluded."""
-        try:
-            relative_path = file_path.relative_to(base_path)
-            relative_str = str(relative_path)
-
-            for pattern in exclude_patterns:
-                if fnmatch.fnmatch(relative_str, pattern):
-                    return True
+        exclude_re = _pattern_regex(tuple(exclude_patterns))
+        if exclude_re is None:
             return False
+
+        try:
+            relative_str = str(file_path.relative_to(base_path))
         except ValueError:
             return False
+        return exclude_re.match(os.path.normcase(relative_str)) is not None
 
     @staticmethod
     def run_command(
@@ -101,10 +241,13 @@ class ValidationHelper:
     def check_python_syntax(file_path: str) -> Tuple[bool, Optional[str]]:
         """Check Python file syntax."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
+            # Bytes let the parser decode per the file's coding declaration
+            with open(file_path, "rb") as f:
                 content = f.read()
 
-            compile(content, file_path, "exec")
+            # Compile fully, as errors such as 'return' outside a function are
+            # only raised by the compiler stage, not the parser
+            compile(content, file_path, "exec", dont_inherit=True)
             return True, None
         except SyntaxError as e:
             error_msg = f"Syntax error in {file_path} at line {e.lineno}: {e.msg}"
@@ -113,26 +256,169 @@ class ValidationHelper:
             error_msg = f"Error checking syntax in {file_path}: {str(e)}"
             return False, error_msg
 
+    @staticmethod
+    def check_python_syntax_batch(
+        file_paths: List[str], cache_path: Optional[str] = None
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Check the syntax of many Python files, in the order given.
+
+        With a cache_path, files that passed before and whose modification
+        time and size are unchanged are not parsed again. Only passing files
+        are cached, so failures are always re-checked and reported afresh.
+        The cache is kept per Python version and holds at most
+        SYNTAX_CACHE_SIZE files, dropping the least recently checked.
+        """
+        if not cache_path:
+            return ValidationHelper._check_syntax_all(file_paths)
+        cache_path = os.path.expanduser(cache_path)
+
+        valid_files = ValidationHelper._load_syntax_cache(cache_path)
+        order = list(valid_files)
+        results: List[Optional[Tuple[bool, Optional[str]]]] = [None] * len(file_paths)
+        pending = []
+
+        for index, file_path in enumerate(file_paths):
+            # Stat before parsing, so an edit made meanwhile is re-checked later
+            key = os.path.abspath(file_path)
+            stamp = _file_stamp(file_path)
+            if stamp is not None and valid_files.get(key) == stamp:
+                results[index] = (True, None)
+                # Mark as recently checked for the size limit
+                valid_files[key] = valid_files.pop(key)
+            else:
+                pending.append((index, key, stamp))
+
+        if not pending and list(valid_files) == order:
+            return results
+
+        checked = ValidationHelper._check_syntax_all(
+            [file_paths[index] for index, _, _ in pending]
+        )
+        for (index, key, stamp), outcome in zip(pending, checked):
+            results[index] = outcome
+            valid_files.pop(key, None)
+            if outcome[0] and stamp is not None:
+                valid_files[key] = stamp
+
+        ValidationHelper._save_syntax_cache(cache_path, valid_files)
+        return results
+
+    @staticmethod
+    def _check_syntax_all(file_paths: List[str]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Check the syntax of each file, in the order given.
+
+        Large batches are spread over worker processes; small ones, or
+        environments without process support, are checked serially.
+        """
+        if len(file_paths) > ValidationHelper.PARALLEL_SYNTAX_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(os.cpu_count() or 1, len(file_paths))
+                ) as executor:
+                    # map() yields in submission order, matching file_paths
+                    return list(
+                        executor.map(
+                            ValidationHelper.check_python_syntax,
+                            file_paths,
+                            chunksize=ValidationHelper.SYNTAX_CHUNK_SIZE,
+                        )
+                    )
+            except (OSError, RuntimeError) as e:
+                logging.warning(
+                    f"Parallel syntax check unavailable, falling back to serial: {e}"
+                )
+
+        return [ValidationHelper.check_python_syntax(path) for path in file_paths]
+
+    @staticmethod
+    def _load_syntax_cache(cache_path: str) -> Dict[str, List[int]]:
+        """
+        Load the syntax cache; a missing, corrupt or outdated one, or one
+        written by another Python version, starts empty.
+        """
+        try:
+            with open(cache_path, "rb") as f:
+                cache = load_json(f.read())
+        except (OSError, ValueError):
+            return {}
+
+        if (
+            not isinstance(cache, dict)
+            or cache.get("version") != ValidationHelper.SYNTAX_CACHE_VERSION
+            or cache.get("python") != _PYTHON_VERSION
+        ):
+            return {}
+        valid_files = cache.get("files")
+        return valid_files if isinstance(valid_files, dict) else {}
+
+    @staticmethod
+    def _save_syntax_cache(cache_path: str, valid_files: Dict[str, List[int]]):
+        """
+        Write the syntax cache atomically; failures only cost a re-check.
+
+        Only the most recently checked files are kept, and files that no
+        longer exist are dropped.
+        """
+        recent = list(valid_files.items())[-ValidationHelper.SYNTAX_CACHE_SIZE :]
+        valid_files = {path: stamp for path, stamp in recent if os.path.exists(path)}
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(
+                    dump_json(
+                        {
+                            "version": ValidationHelper.SYNTAX_CACHE_VERSION,
+                            "python": _PYTHON_VERSION,
+                            "files": valid_files,
+                        }
+                    )
+                )
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logging.debug(f"Could not write syntax cache {cache_path}: {e}")
+
     @staticmethod
     def find_test_files(
         codebase_path: str, test_patterns: List[str], test_directories: List[str]
     ) -> List[str]:
         """Find test files in the codebase."""
-        test_files = []
+        test_files = set()
         codebase_path = Path(codebase_path)
 
-        # Look in test directories
-        for test_dir in test_directories:
-            test_dir_path = codebase_path / test_dir
-            if test_dir_path.exists():
-                for pattern in test_patterns:
-                    test_files.extend(test_dir_path.glob(pattern))
+        # File name patterns are all matched in a single walk of the codebase,
+        # which also covers test directories inside it
+        name_patterns = tuple(
+            pattern
+            for pattern in test_patterns
+            if "/" not in pattern and os.sep not in pattern
+        )
+        name_re = _pattern_regex(name_patterns)
+        if name_re is not None:
+            test_files.update(
+                file_path
+                for file_path, relative in _scan_files(str(codebase_path))
+                if name_re.match(os.path.normcase(os.path.basename(relative)))
+            )
 
-        # Look for test files in the main codebase
+        # Patterns with a directory part still need their own glob
         for pattern in test_patterns:
-            test_files.extend(codebase_path.glob(f"**/{pattern}"))
+            if pattern not in name_patterns:
+                test_files.update(map(str, codebase_path.glob(f"**/{pattern}")))
+
+        # Look in test directories outside the codebase
+        for test_dir in test_directories:
+            if Path(test_dir).is_absolute() or ".." in Path(test_dir).parts:
+                test_dir_path = codebase_path / test_dir
+                if test_dir_path.exists():
+                    for pattern in test_patterns:
+                        test_files.update(map(str, test_dir_path.glob(pattern)))
 
-        return [str(f) for f in set(test_files)]
+        return list(test_files)
 
     @staticmethod
     def extract_requirements_from_csv(csv_path: str) -> List[Dict[str, str]]:
@@ -145,15 +431,12 @@ class ValidationHelper:
         try:
             import csv
 
-            with open(csv_path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    requirements.append(
-                        {
-                            "id": row.get("id", ""),
-                            "description": row.get("description", ""),
-                        }
-                    )
+            with open(csv_path, "r", encoding="utf-8", newline="") as f:
+                # Rows read before an error are kept, as extend appends as it goes
+                requirements.extend(
+                    {"id": row.get("id", ""), "description": row.get("description", "")}
+                    for row in csv.DictReader(f)
+                )
         except Exception as e:
             logging.warning(f"Could not read requirements from {csv_path}: {e}")
 
@@ -162,37 +445,83 @@ class ValidationHelper:
     @staticmethod
     def create_file_function_summary(metadata: Dict[str, Any]) -> str:
         """Create a summary of files and functions from metadata."""
+        return ValidationHelper.create_summary_and_counts(metadata)[0]
+
+    @staticmethod
+    def create_summary_and_counts(metadata: Dict[str, Any]) -> Tuple[str, int, int]:
+        """
+        Create a summary of files and functions, counting them on the way.
+
+        Returns:
+            The summary, the number of functions including methods, and the
+            number of classes
+        """
         summary_parts = []
+        append = summary_parts.append
+        functions_count = 0
+        classes_count = 0
 
         for file_data in metadata.get("files", []):
             file_path = file_data.get("path", "")
-            summary_parts.append(f"\nFile: {file_path}")
+            append(f"\nFile: {file_path}")
 
             # Add functions
-            for func in file_data.get("functions", []):
+            functions = file_data.get("functions", [])
+            functions_count += len(functions)
+            for func in functions:
                 func_name = func.get("name", "")
                 args = func.get("args", [])
                 docstring = func.get("docstring", "")
 
-                summary_parts.append(f"  Function: {func_name}({', '.join(args)})")
+                append(f"  Function: {func_name}({', '.join(args)})")
                 if docstring:
                     # Truncate long docstrings
                     short_doc = docstring.split("\n")[0][:100]
-                    summary_parts.append(f"    Description: {short_doc}")
+                    append(f"    Description: {short_doc}")
 
             # Add classes and methods
-            for cls in file_data.get("classes", []):
+            classes = file_data.get("classes", [])
+            classes_count += len(classes)
+            for cls in classes:
                 cls_name = cls.get("name", "")
-                summary_parts.append(f"  Class: {cls_name}")
+                append(f"  Class: {cls_name}")
 
-                for method in cls.get("methods", []):
+                methods = cls.get("methods", [])
+                functions_count += len(methods)
+                for method in methods:
                     method_name = method.get("name", "")
                     args = method.get("args", [])
-                    summary_parts.append(
-                        f"    Method: {method_name}({', '.join(args)})"
-                    )
+                    append(f"    Method: {method_name}({', '.join(args)})")
 
-        return "\n".join(summary_parts)
+        return "\n".join(summary_parts), functions_count, classes_count
+
+    @staticmethod
+    def compress_file_functions(summary: str) -> str:
+        """
+        Shorten a file and function summary for use in an AI prompt.
+
+        Labels become one-letter sigils explained by a legend line, blank
+        lines and indentation are dropped, and filler words are removed from
+        descriptions. File paths and signatures are kept verbatim.
+        """
+        lines = [_SUMMARY_LEGEND]
+
+        for line in summary.splitlines():
+            match = _SUMMARY_LINE_RE.match(line)
+            if match is None:
+                line = " ".join(line.split())
+                if line:
+                    lines.append(line)
+                continue
+
+            label, body = match.groups()
+            if label == "Description":
+                body = " ".join(
+                    word for word in body.split() if word.lower() not in FILLER_WORDS
+                )
+            lines.append(f"{_SUMMARY_LABELS[label]}:{body}")
+
+        return "\n".join(lines)
 
     @staticmethod
     def save_report(
@@ -202,8 +531,8 @@ class ValidationHelper:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
         if format_type == "json":
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
+            with open(output_path, "wb") as f:
+                f.write(dump_json(report_data, indent=True))
         elif format_type == "yaml":
             try:
                 import yaml
@@ -221,25 +550,22 @@ class ValidationHelper:
     @staticmethod
     def _write_text_report(report_data: Dict[str, Any], file_handle):
         """Write validation report in text format."""
-        file_handle.write("VALIDATION REPORT\n")
-        file_handle.write("=" * 50 + "\n\n")
+        # Build the whole report and write it once
+        parts = ["VALIDATION REPORT\n", "=" * 50 + "\n\n"]
+        append = parts.append
 
-        file_handle.write(
-            f"Overall Status: {report_data.get('overall_status', 'unknown')}\n"
-        )
-        file_handle.write(f"Valid: {report_data.get('is_valid', False)}\n")
-        file_handle.write(f"Total Errors: {report_data.get('total_error_count', 0)}\n")
-        file_handle.write(
-            f"Total Warnings: {report_data.get('total_warning_count', 0)}\n\n"
-        )
+        append(f"Overall Status: {report_data.get('overall_status', 'unknown')}\n")
+        append(f"Valid: {report_data.get('is_valid', False)}\n")
+        append(f"Total Errors: {report_data.get('total_error_count', 0)}\n")
+        append(f"Total Warnings: {report_data.get('total_warning_count', 0)}\n\n")
 
         for step_result in report_data.get("step_results", []):
-            file_handle.write(f"Step: {step_result.get('step_name', '')}\n")
-            file_handle.write(f"Status: {step_result.get('status', '')}\n")
-            file_handle.write(f"Valid: {step_result.get('is_valid', False)}\n")
+            append(f"Step: {step_result.get('step_name', '')}\n")
+            append(f"Status: {step_result.get('status', '')}\n")
+            append(f"Valid: {step_result.get('is_valid', False)}\n")
 
             if step_result.get("problems"):
-                file_handle.write("Problems:\n")
+                append("Problems:\n")
                 for problem in step_result["problems"]:
                     severity = problem.get("severity", "").upper()
                     message = problem.get("message", "")
@@ -247,9 +573,11 @@ class ValidationHelper:
                     line_num = problem.get("line_number", "")
 
                     location = f" ({file_path}:{line_num})" if file_path else ""
-                    file_handle.write(f"  [{severity}] {message}{location}\n")
+                    append(f"  [{severity}] {message}{location}\n")
+
+            append("\n")
 
-            file_handle.write("\n")
+        file_handle.write("".join(parts))
 
     @staticmethod
     def setup_logging(log_level: str = "INFO", verbose: bool = False):
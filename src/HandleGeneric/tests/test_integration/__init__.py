@@ -3,4 +3,3 @@ Integration tests for HandleGeneric package.
 """
 
 from .test_end_to_end import *
-from .test_cli import *
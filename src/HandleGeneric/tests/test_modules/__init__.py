@@ -0,0 +1,3 @@
+"""
+Tests for HandleGeneric modules.
+"""
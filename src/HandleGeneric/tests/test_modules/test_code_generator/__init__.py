@@ -0,0 +1,7 @@
+"""
+Tests for the code generator module.
+"""
+
+from .test_analyzer import *
+from .test_generator import *
+from .test_integrator import *
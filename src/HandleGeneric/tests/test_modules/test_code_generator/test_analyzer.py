@@ -0,0 +1,72 @@
+"""
+Tests for the code generator module's requirement analyzer.
+"""
+
+import pytest
+
+from HandleGeneric.modules.code_generator.GenerateCodeFromRequirements.core import (
+    analyzer,
+)
+
+# Pytest support and test files are given more entities than the real
+# implementation, so they would win if they were not excluded
+METADATA = {
+    "files": [
+        {
+            "path": "conftest.py",
+            "functions": [{"name": f"fixture_{i}"} for i in range(5)],
+        },
+        {"path": "test.py", "functions": [{"name": f"check_{i}"} for i in range(4)]},
+        {"path": "tests.py", "functions": [{"name": f"case_{i}"} for i in range(4)]},
+        {
+            "path": "tests/test_calculator.py",
+            "functions": [{"name": f"test_{i}"} for i in range(3)],
+        },
+        {"path": "calculator/conftest.py", "functions": [{"name": "numbers"}] * 3},
+        {
+            "path": "calculator/calculator.py",
+            "functions": [{"name": "add"}],
+            "classes": [{"name": "Calculator"}],
+        },
+        {"path": "calculator/__init__.py"},
+        {"path": "main.py", "functions": [{"name": "run"}] * 6},
+    ]
+}
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "conftest.py",
+        "pkg/conftest.py",
+        "test.py",
+        "tests.py",
+        "pkg\\tests.py",
+        "tests/helpers.py",
+        "pkg/test_module.py",
+        "pkg/module_test.py",
+        "pkg/__pycache__/module.py",
+    ],
+)
+def test_non_implementation_paths(path):
+    """Test that test and pytest support paths are not implementation files."""
+    assert analyzer._NON_IMPL_RE.search(path)
+
+
+@pytest.mark.parametrize(
+    "path", ["calculator/calculator.py", "contest.py", "attestation.py", "main.py"]
+)
+def test_implementation_paths(path):
+    """Test that ordinary modules are implementation files."""
+    assert not analyzer._NON_IMPL_RE.search(path)
+
+
+def test_fallback_target_is_never_a_pytest_support_file():
+    """Test that a requirement matching no files targets the implementation."""
+    result = analyzer.GenerationResult(status=analyzer.GenerationStatus.SUCCESS)
+
+    (requirement,) = analyzer.RequirementAnalyzer().analyze_requirements(
+        {"REQ-1": "It should be robust"}, METADATA, result
+    )
+
+    assert requirement.target_files == ["calculator/calculator.py"]
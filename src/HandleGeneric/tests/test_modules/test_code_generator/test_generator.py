@@ -0,0 +1,32 @@
+"""
+Tests for the code generator module's generator.
+"""
+
+import logging
+
+from HandleGeneric.modules.code_generator.GenerateCodeFromRequirements.core import (
+    generator,
+)
+
+
+class TestRunValidation:
+    """Test cases for running validation on the generated code."""
+
+    def test_validation_unit_is_available(self):
+        """Test that the sibling validation unit is found in this layout."""
+        assert generator.CodebaseValidator is not None
+
+    def test_host_logging_left_alone(self, monkeypatch):
+        """Test that the validator is built without configuring logging."""
+        configured = []
+        monkeypatch.setattr(
+            logging, "basicConfig", lambda **kwargs: configured.append(kwargs)
+        )
+        logger = logging.getLogger("host")
+
+        validator = generator.CodebaseValidator(
+            generator.ValidationConfig(), logger=logger
+        )
+
+        assert validator.logger is logger
+        assert configured == []
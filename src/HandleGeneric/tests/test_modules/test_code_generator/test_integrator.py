@@ -0,0 +1,413 @@
+"""
+Tests for the code generator module's code integrator.
+"""
+
+import importlib
+import json
+
+import pytest
+
+from HandleGeneric.modules.code_generator.GenerateCodeFromRequirements.core import (
+    integrator,
+)
+
+CodeChange = integrator.CodeChange
+ChangeType = integrator.ChangeType
+GenerationResult = integrator.GenerationResult
+# The integrator imports its models as a top-level package
+GenerationStatus = importlib.import_module(GenerationResult.__module__).GenerationStatus
+
+FUNCTION = "def f():\n    return 1"
+METHOD = "def g(self):\n    return 2"
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """Empty output directory for the integrator to change files in."""
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    return output_dir
+
+
+@pytest.fixture
+def summary_cache_path(tmp_path):
+    """Parse summary cache file outside the output directory."""
+    return tmp_path / "cache" / "ast_summaries.json"
+
+
+def apply_changes(output_dir, changes, code_integrator=None):
+    """Apply changes and return whether they all applied, and the result."""
+    if code_integrator is None:
+        code_integrator = integrator.CodeIntegrator(
+            summary_cache_path=str(output_dir.parent / "cache" / "summaries.json")
+        )
+    result = GenerationResult(status=GenerationStatus.IN_PROGRESS)
+    applied = code_integrator.apply_code_changes(changes, str(output_dir), result)
+    return applied, result
+
+
+class TestAddFunction:
+    """Test cases for adding a function to an existing file."""
+
+    @pytest.mark.parametrize(
+        "original, expected",
+        [
+            # Only imports: appended as is
+            (
+                "import os\nfrom x import y  # c\n\n",
+                "import os\nfrom x import y  # c\n\n\n\n" + FUNCTION,
+            ),
+            # A docstring counts as content: tidied like any other module
+            (
+                '"""Module docs."""\nimport os\n\n',
+                '"""Module docs."""\nimport os\n\n' + FUNCTION + "\n",
+            ),
+            (
+                "import os\n\nX = 1\n",
+                "import os\n\nX = 1\n\n" + FUNCTION + "\n",
+            ),
+        ],
+    )
+    def test_appended_layout(self, output_dir, original, expected):
+        """Test where and how the function is appended."""
+        (output_dir / "module.py").write_text(original)
+
+        applied, _ = apply_changes(
+            output_dir,
+            [CodeChange(ChangeType.ADD_FUNCTION, "module.py", FUNCTION, "REQ-1")],
+        )
+
+        assert applied
+        assert (output_dir / "module.py").read_text() == expected
+
+    def test_only_has_imports(self):
+        """Test which modules count as only having imports."""
+        code_integrator = integrator.CodeIntegrator()
+
+        assert code_integrator._only_has_imports("import os\n# comment\n")
+        assert not code_integrator._only_has_imports('"""Docs."""\nimport os\n')
+        assert not code_integrator._only_has_imports("import os\nX = 1\n")
+
+
+class TestSummaryCache:
+    """Test cases for the persisted parse summary cache."""
+
+    def test_defaults_to_user_cache_directory(self):
+        """Test that the cache is not placed relative to the output directory."""
+        code_integrator = integrator.CodeIntegrator()
+
+        assert code_integrator.summary_cache_path == (
+            integrator.DEFAULT_SUMMARY_CACHE_PATH
+        )
+        assert code_integrator.summary_cache_path.is_absolute()
+
+    def test_written_only_to_configured_path(
+        self, tmp_path, output_dir, summary_cache_path
+    ):
+        """Test that applying changes writes nothing beside the output directory."""
+        (output_dir / "module.py").write_text("import os\n")
+        code_integrator = integrator.CodeIntegrator(
+            summary_cache_path=str(summary_cache_path)
+        )
+
+        apply_changes(
+            output_dir,
+            [CodeChange(ChangeType.ADD_FUNCTION, "module.py", FUNCTION, "REQ-1")],
+            code_integrator,
+        )
+
+        assert summary_cache_path.is_file()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["cache", "out"]
+        assert [p.name for p in output_dir.iterdir()] == ["module.py"]
+
+    def test_reused_by_a_new_integrator(self, output_dir, summary_cache_path):
+        """Test that a later run answers from the persisted summaries."""
+        (output_dir / "module.py").write_text("import os\n")
+        change = CodeChange(ChangeType.ADD_FUNCTION, "module.py", FUNCTION, "REQ-1")
+        apply_changes(
+            output_dir,
+            [change],
+            integrator.CodeIntegrator(summary_cache_path=str(summary_cache_path)),
+        )
+
+        later = integrator.CodeIntegrator(summary_cache_path=str(summary_cache_path))
+        later._load_summaries(summary_cache_path)
+
+        assert any(summary["only_imports"] for summary in later._summaries.values())
+
+    def test_concurrent_runs_keep_each_others_summaries(
+        self, output_dir, summary_cache_path
+    ):
+        """Test that a run does not drop summaries another run stored meanwhile."""
+        first = integrator.CodeIntegrator(summary_cache_path=str(summary_cache_path))
+        second = integrator.CodeIntegrator(summary_cache_path=str(summary_cache_path))
+        # Both runs start before either has stored anything
+        first._load_summaries(summary_cache_path)
+        second._load_summaries(summary_cache_path)
+        (output_dir / "a.py").write_text("import os\n")
+        (output_dir / "b.py").write_text("import sys\n")
+
+        apply_changes(
+            output_dir,
+            [CodeChange(ChangeType.ADD_FUNCTION, "a.py", FUNCTION, "REQ-1")],
+            first,
+        )
+        apply_changes(
+            output_dir,
+            [CodeChange(ChangeType.ADD_FUNCTION, "b.py", FUNCTION, "REQ-2")],
+            second,
+        )
+
+        later = integrator.CodeIntegrator(summary_cache_path=str(summary_cache_path))
+        assert set(later._read_summaries(summary_cache_path)) == {
+            later._ast_key("import os\n").hex(),
+            later._ast_key("import sys\n").hex(),
+        }
+
+    def test_replaced_without_leftovers(self, output_dir, summary_cache_path):
+        """Test that the cache is written through a temporary file."""
+        summary_cache_path.parent.mkdir()
+        summary_cache_path.write_text("{not json")
+        (output_dir / "module.py").write_text("import os\n")
+
+        apply_changes(
+            output_dir,
+            [CodeChange(ChangeType.ADD_FUNCTION, "module.py", FUNCTION, "REQ-1")],
+            integrator.CodeIntegrator(summary_cache_path=str(summary_cache_path)),
+        )
+
+        assert [p.name for p in summary_cache_path.parent.iterdir()] == [
+            summary_cache_path.name
+        ]
+        stored = json.loads(summary_cache_path.read_text())
+        assert stored["version"] == integrator.CodeIntegrator.SUMMARY_CACHE_VERSION
+
+
+class TestApplyCodeChanges:
+    """Test cases for applying changes grouped by target file."""
+
+    def test_changes_to_one_file_apply_in_order(self, output_dir):
+        """Test that later changes to a file see the earlier ones."""
+        changes = [
+            CodeChange(
+                ChangeType.CREATE_FILE, "module.py", "class A:\n    x = 1\n", "R1"
+            ),
+            CodeChange(
+                ChangeType.ADD_METHOD, "module.py", METHOD, "R2", target_class="A"
+            ),
+            CodeChange(ChangeType.ADD_IMPORT, "module.py", "import os", "R3"),
+            CodeChange(ChangeType.ADD_FUNCTION, "module.py", FUNCTION, "R4"),
+        ]
+
+        applied, result = apply_changes(output_dir, changes)
+
+        assert applied
+        assert (output_dir / "module.py").read_text() == (
+            "import os\nclass A:\n    x = 1\n\n    "
+            + METHOD.replace("\n", "\n    ")
+            + "\n\n"
+            + FUNCTION
+            + "\n"
+        )
+        assert result.files_created == [str(output_dir / "module.py")]
+        assert result.files_modified == [str(output_dir / "module.py")]
+
+    def test_replacement_discards_earlier_changes(self, output_dir):
+        """Test that a later full replacement wins over earlier edits."""
+        (output_dir / "module.py").write_text("X = 1\n")
+        changes = [
+            CodeChange(ChangeType.ADD_FUNCTION, "module.py", FUNCTION, "R1"),
+            CodeChange(ChangeType.MODIFY_FILE, "module.py", "Y = 2\n", "R2"),
+            CodeChange(ChangeType.ADD_IMPORT, "module.py", "import os", "R3"),
+        ]
+
+        applied, result = apply_changes(output_dir, changes)
+
+        assert applied
+        assert (output_dir / "module.py").read_text() == "import os\nY = 2\n"
+        assert result.files_modified == [str(output_dir / "module.py")]
+
+    def test_results_merge_in_first_seen_file_order(self, output_dir):
+        """Test that interleaved changes are grouped per file, in order."""
+        for name in ("a.py", "b.py", "c.py"):
+            (output_dir / name).write_text("X = 1\n")
+        changes = [
+            CodeChange(ChangeType.ADD_FUNCTION, "c.py", FUNCTION, "R1"),
+            CodeChange(ChangeType.ADD_FUNCTION, "a.py", FUNCTION, "R2"),
+            CodeChange(ChangeType.ADD_IMPORT, "c.py", "import os", "R3"),
+            CodeChange(ChangeType.ADD_FUNCTION, "b.py", FUNCTION, "R4"),
+            CodeChange(ChangeType.ADD_IMPORT, "a.py", "import sys", "R5"),
+        ]
+
+        applied, result = apply_changes(output_dir, changes)
+
+        assert applied
+        assert result.files_modified == [
+            str(output_dir / name) for name in ("c.py", "a.py", "b.py")
+        ]
+        assert (output_dir / "a.py").read_text() == (
+            "import sys\nX = 1\n\n" + FUNCTION + "\n"
+        )
+        assert (output_dir / "b.py").read_text() == "X = 1\n\n" + FUNCTION + "\n"
+        assert (output_dir / "c.py").read_text() == (
+            "import os\nX = 1\n\n" + FUNCTION + "\n"
+        )
+
+    def test_failed_change_does_not_stop_the_file(self, output_dir):
+        """Test that a failing change is reported and the rest still apply."""
+        (output_dir / "module.py").write_text("X = 1\n")
+        changes = [
+            CodeChange(
+                ChangeType.ADD_METHOD, "module.py", METHOD, "R1", target_class="A"
+            ),
+            CodeChange(ChangeType.ADD_FUNCTION, "module.py", FUNCTION, "R2"),
+            CodeChange(ChangeType.MODIFY_FILE, "missing.py", "Y = 2\n", "R3"),
+        ]
+
+        applied, result = apply_changes(output_dir, changes)
+
+        assert not applied
+        assert (output_dir / "module.py").read_text() == "X = 1\n\n" + FUNCTION + "\n"
+        assert not (output_dir / "missing.py").exists()
+        assert [problem.requirement_id for problem in result.problems] == ["R1", "R3"]
+        assert result.files_modified == [str(output_dir / "module.py")]
+
+
+class TestImportInsertionOffset:
+    """Test cases for where imports are inserted after the module header."""
+
+    @pytest.mark.parametrize(
+        "header, rest",
+        [
+            ("", ""),
+            ("", "X = 1\n"),
+            ("import os\n", ""),
+            ("#!/usr/bin/env python\n# -*- coding: utf-8 -*-\n", "X = 1\n"),
+            ('"""Docs.\n\nMore.\n"""\nimport os\n', "X = 1\n"),
+            ("r'''Docs with \\''' inside.'''\n", "X = 1\n"),
+            (
+                "import os\nfrom a import (\n    b,  # not ) here\n    c,\n)\n",
+                "X = 1\n",
+            ),
+            ("from a import \\\n    b\n", "X = 1\n"),
+            ("# comment\nimport os\n", "\ndef f():\n    pass\n"),
+            ("import os\r\n", "X = 1\r\n"),
+        ],
+    )
+    def test_offset_is_end_of_header(self, header, rest):
+        """Test that the offset falls right after the header."""
+        code_integrator = integrator.CodeIntegrator()
+
+        assert code_integrator._import_insertion_offset(header + rest) == len(header)
+
+    def test_import_spliced_at_offset(self, output_dir):
+        """Test that an added import lands after the header."""
+        (output_dir / "module.py").write_text('"""Docs."""\nimport os\n\nX = 1\n')
+
+        applied, _ = apply_changes(
+            output_dir,
+            [CodeChange(ChangeType.ADD_IMPORT, "module.py", "import sys", "R1")],
+        )
+
+        assert applied
+        assert (output_dir / "module.py").read_text() == (
+            '"""Docs."""\nimport os\nimport sys\n\nX = 1\n'
+        )
+
+    def test_header_without_final_newline(self, output_dir):
+        """Test that a newline is added before an import at end of file."""
+        (output_dir / "module.py").write_text("import os")
+
+        apply_changes(
+            output_dir,
+            [CodeChange(ChangeType.ADD_IMPORT, "module.py", "import sys", "R1")],
+        )
+
+        assert (output_dir / "module.py").read_text() == "import os\nimport sys\n"
+
+
+class TestAddMethod:
+    """Test cases for splicing a method in at the end of a class."""
+
+    @pytest.mark.parametrize(
+        "original, expected",
+        [
+            # Last class in the file
+            (
+                "class A:\n    def f(self):\n        return 1\n",
+                "class A:\n    def f(self):\n        return 1\n\n"
+                "    def g(self):\n        return 2\n",
+            ),
+            # No final newline
+            (
+                "class A:\n    x = 1",
+                "class A:\n    x = 1\n\n    def g(self):\n        return 2\n",
+            ),
+            # Followed by other code
+            (
+                "class A:\n    x = 1\n\n\nclass B:\n    y = 2\n",
+                "class A:\n    x = 1\n\n    def g(self):\n        return 2\n"
+                "\n\nclass B:\n    y = 2\n",
+            ),
+            # Nested class, indented like its body
+            (
+                "class Outer:\n    class A:\n        x = 1\n\n    z = 3\n",
+                "class Outer:\n    class A:\n        x = 1\n\n"
+                "        def g(self):\n            return 2\n\n    z = 3\n",
+            ),
+        ],
+    )
+    def test_spliced_after_last_line(self, output_dir, original, expected):
+        """Test that the method is indented and placed after the class body."""
+        (output_dir / "module.py").write_text(original)
+
+        applied, _ = apply_changes(
+            output_dir,
+            [
+                CodeChange(
+                    ChangeType.ADD_METHOD, "module.py", METHOD, "R1", target_class="A"
+                )
+            ],
+        )
+
+        assert applied
+        assert (output_dir / "module.py").read_text() == expected
+
+    def test_repeated_additions_to_last_class(self, output_dir):
+        """Test that methods added one after another keep their order."""
+        (output_dir / "module.py").write_text("import os\n\n\nclass A:\n    x = 1\n")
+        changes = [
+            CodeChange(
+                ChangeType.ADD_METHOD,
+                "module.py",
+                f"def m{i}(self):\n    return {i}",
+                f"R{i}",
+                target_class="A",
+            )
+            for i in range(3)
+        ]
+
+        applied, _ = apply_changes(output_dir, changes)
+
+        assert applied
+        assert (output_dir / "module.py").read_text() == (
+            "import os\n\n\nclass A:\n    x = 1\n"
+            + "".join(f"\n    def m{i}(self):\n        return {i}\n" for i in range(3))
+        )
+
+    def test_missing_class_fails(self, output_dir):
+        """Test that a change for an unknown class is reported."""
+        (output_dir / "module.py").write_text("class B:\n    x = 1\n")
+
+        applied, result = apply_changes(
+            output_dir,
+            [
+                CodeChange(
+                    ChangeType.ADD_METHOD, "module.py", METHOD, "R1", target_class="A"
+                )
+            ],
+        )
+
+        assert not applied
+        assert (output_dir / "module.py").read_text() == "class B:\n    x = 1\n"
+        assert len(result.problems) == 1
@@ -0,0 +1,6 @@
+"""
+Tests for the validator module.
+"""
+
+from .test_ai_validator import *
+from .test_helpers import *
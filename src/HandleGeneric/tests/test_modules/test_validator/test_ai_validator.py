@@ -0,0 +1,250 @@
+"""
+Tests for the validator module's AI validator.
+"""
+
+import os
+import time
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+
+from HandleGeneric.modules.validator.ValidationUnit.core.ai_validator import (
+    AIValidator,
+)
+from HandleGeneric.modules.validator.ValidationUnit.models.validation_result import (
+    ValidationResult,
+    ValidationStatus,
+)
+from HandleGeneric.modules.validator.ValidationUnit.utils.config import (
+    ValidationConfig,
+)
+
+VERDICT = '{"valid": true, "problems": [], "suggestions": []}'
+
+
+class FakeStream:
+    """Fake streamed completion yielding the given text chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for text in self.chunks:
+            self.read += 1
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]
+            )
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def validator(tmp_path):
+    """AI validator whose response cache lives in a temporary directory."""
+    config = ValidationConfig(ai_cache_dir=str(tmp_path / "ai_cache"))
+    return AIValidator(config)
+
+
+class TestReadStreamedResponse:
+    """Test cases for AIValidator._read_streamed_response."""
+
+    def test_plain_object(self):
+        """Test a response that is just the JSON object."""
+        stream = FakeStream(
+            ['{"valid": true, ', '"problems": [], ', '"suggestions": []}']
+        )
+        assert AIValidator._read_streamed_response(stream) == VERDICT
+
+    def test_fenced_object_split_inside_closing_fence(self):
+        """Test a chunk that closes the object and starts the closing fence."""
+        stream = FakeStream(
+            [
+                "```json\n",
+                '{"valid": true, "problems":',
+                " []",
+                ', "suggestions": []}\n`',
+                "``",
+            ]
+        )
+        assert AIValidator._read_streamed_response(stream) == VERDICT
+
+    def test_stops_reading_once_object_is_complete(self):
+        """Test that chunks after the object are not read and the stream is closed."""
+        stream = FakeStream([VERDICT + "\n``", "`\nTrailing commentary"])
+        assert AIValidator._read_streamed_response(stream) == VERDICT
+        assert stream.read == 1
+        assert stream.closed
+
+    def test_incomplete_object_returns_all_text(self):
+        """Test a stream that ends before the object is complete."""
+        stream = FakeStream(['{"valid": true, ', '"problems": ['])
+        assert (
+            AIValidator._read_streamed_response(stream)
+            == '{"valid": true, "problems": ['
+        )
+
+    def test_split_fence_verdict_stays_valid(self, validator):
+        """Test that a fence split across chunks does not turn a valid verdict invalid."""
+        validator._request_analysis = (
+            lambda prompt: AIValidator._read_streamed_response(
+                FakeStream(
+                    [
+                        "```json\n{",
+                        '"valid": true, "problems": []',
+                        ', "suggestions": []}\n``',
+                        "`",
+                    ]
+                )
+            )
+        )
+        result = ValidationResult(
+            step_name="AI Logic Validation",
+            status=ValidationStatus.VALID,
+            is_valid=True,
+        )
+
+        ai_response = validator._perform_ai_analysis(
+            {"requirements": [], "file_functions": ""}, result
+        )
+
+        assert ai_response == {"valid": True, "problems": [], "suggestions": []}
+        assert result.warning_count() == 0
+
+
+class FakeCompletions:
+    """Fake completions endpoint counting the requests it answers."""
+
+    def __init__(self, text=VERDICT):
+        self.text = text
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))]
+        )
+
+
+def cached_validator(cache_dir, completions, **options):
+    """AI validator with a fake client and its response cache in cache_dir."""
+    config = ValidationConfig(
+        ai_cache_dir=str(cache_dir), ai_stream_responses=False, **options
+    )
+    validator = AIValidator(config)
+    validator.ai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return validator
+
+
+class TestResponseCache:
+    """Test cases for the AI response cache and its expiry."""
+
+    def test_repeated_prompt_is_answered_from_memory(self, tmp_path):
+        """Test that the client is asked once for the same prompt."""
+        completions = FakeCompletions()
+        validator = cached_validator(tmp_path, completions)
+
+        assert validator._request_analysis("Check this code") == VERDICT
+        assert validator._request_analysis("Check  this\ncode") == VERDICT
+        assert completions.calls == 1
+
+    def test_different_prompts_are_requested(self, tmp_path):
+        """Test that a cached response is not reused for another prompt."""
+        completions = FakeCompletions()
+        validator = cached_validator(tmp_path, completions)
+
+        validator._request_analysis("Check this code")
+        validator._request_analysis("Check that code")
+
+        assert completions.calls == 2
+
+    def test_persisted_for_a_new_validator(self, tmp_path):
+        """Test that a later run answers from the cache directory."""
+        cached_validator(tmp_path, FakeCompletions())._request_analysis("Check")
+        completions = FakeCompletions()
+
+        response = cached_validator(tmp_path, completions)._request_analysis("Check")
+
+        assert response == VERDICT
+        assert completions.calls == 0
+        assert [p.suffix for p in tmp_path.iterdir()] == [".json"]
+
+    def test_expired_response_is_requested_again(self, tmp_path, monkeypatch):
+        """Test that a response older than the TTL is not reused."""
+        completions = FakeCompletions()
+        validator = cached_validator(tmp_path, completions, ai_cache_ttl_seconds=60)
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        validator._request_analysis("Check")
+
+        monkeypatch.setattr(time, "time", lambda: now + 59)
+        validator._request_analysis("Check")
+        assert completions.calls == 1
+
+        monkeypatch.setattr(time, "time", lambda: now + 61)
+        validator._request_analysis("Check")
+        assert completions.calls == 2
+
+    def test_expired_response_on_disk_is_requested_again(self, tmp_path, monkeypatch):
+        """Test that the TTL also applies to responses read from disk."""
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        cached_validator(tmp_path, FakeCompletions())._request_analysis("Check")
+        completions = FakeCompletions()
+
+        monkeypatch.setattr(time, "time", lambda: now + 61)
+        cached_validator(
+            tmp_path, completions, ai_cache_ttl_seconds=60
+        )._request_analysis("Check")
+
+        assert completions.calls == 1
+
+    def test_corrupt_cache_file_is_a_miss(self, tmp_path):
+        """Test that an unreadable cache entry falls back to the client."""
+        cached_validator(tmp_path, FakeCompletions())._request_analysis("Check")
+        for cache_file in tmp_path.iterdir():
+            cache_file.write_text("{not json")
+        completions = FakeCompletions()
+
+        response = cached_validator(tmp_path, completions)._request_analysis("Check")
+
+        assert response == VERDICT
+        assert completions.calls == 1
+
+    def test_disabled_cache_always_requests(self, tmp_path):
+        """Test that nothing is cached or reused when the cache is disabled."""
+        cache_dir = tmp_path / "ai_cache"
+        completions = FakeCompletions()
+        validator = cached_validator(cache_dir, completions, ai_cache_enabled=False)
+
+        validator._request_analysis("Check")
+        validator._request_analysis("Check")
+
+        assert completions.calls == 2
+        assert not cache_dir.exists()
+
+    def test_memory_cache_is_bounded(self, tmp_path, monkeypatch):
+        """Test that the oldest responses are evicted from memory."""
+        monkeypatch.setattr(AIValidator, "RESPONSE_CACHE_SIZE", 2)
+        validator = cached_validator(tmp_path, FakeCompletions())
+
+        for prompt in ("one", "two", "three"):
+            validator._request_analysis(prompt)
+
+        assert len(validator._response_cache) == 2
+
+
+class TestResponseCacheLocation:
+    """Test cases for where AI responses are cached."""
+
+    def test_defaults_to_user_cache_directory(self):
+        """Test that the default cache does not depend on the working directory."""
+        assert os.path.isabs(ValidationConfig().ai_cache_dir)
+
+    def test_expands_home_directory(self):
+        """Test that a configured ~ path is expanded."""
+        validator = AIValidator(ValidationConfig(ai_cache_dir="~/ai_cache"))
+
+        assert validator._response_cache_dir == Path.home() / "ai_cache"
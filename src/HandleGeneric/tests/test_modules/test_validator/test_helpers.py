@@ -0,0 +1,396 @@
+"""
+Tests for the validator module's helper utilities.
+"""
+
+import fnmatch
+import json
+import os
+import pytest
+from pathlib import Path
+
+from HandleGeneric.modules.validator.ValidationUnit.utils.helpers import (
+    DEFAULT_EXCLUDE_PATTERNS,
+    ValidationHelper,
+)
+from HandleGeneric.modules.validator.ValidationUnit.utils.config import (
+    ValidationConfig,
+)
+
+# Sources the parser accepts but the compiler rejects
+COMPILER_ERRORS = {
+    "return_outside_function.py": "return 1\n",
+    "yield_outside_function.py": "yield 1\n",
+    "await_outside_function.py": "await x\n",
+    "break_outside_loop.py": "break\n",
+    "continue_outside_loop.py": "continue\n",
+    "late_future_import.py": "x = 1\nfrom __future__ import annotations\n",
+    "global_after_assignment.py": "def f():\n    x = 1\n    global x\n",
+}
+
+
+# Files laid out to exercise every default exclude pattern, nested or not
+TREE_FILES = [
+    "main.py",
+    "setup.py",
+    "notes.txt",
+    "module.pyc",
+    ".coverage",
+    ".coverage.py",
+    "pkg/__init__.py",
+    "pkg/core.py",
+    "pkg/core_old.py",
+    "pkg/core.pyc",
+    "pkg/__pycache__/core.cpython-312.pyc",
+    "pkg/__pycache__/stale.py",
+    "pkg/build/generated.py",
+    "pkg/sub/deep/leaf.py",
+    "pkg/tests/test_core.py",
+    "__pycache__/main.py",
+    ".git/hooks/hook.py",
+    ".pytest_cache/v/cache.py",
+    "htmlcov/report.py",
+    "build/lib/pkg.py",
+    "dist/pkg.py",
+    "pkg.egg-info/setup.py",
+    "tests/test_main.py",
+    "tests/conftest.py",
+]
+
+
+def walk_python_files(codebase_path, exclude_patterns=None):
+    """The os.walk and fnmatch scan that get_python_files replaced."""
+    if exclude_patterns is None:
+        exclude_patterns = list(DEFAULT_EXCLUDE_PATTERNS)
+
+    def is_excluded(file_path):
+        relative_str = str(file_path.relative_to(codebase_path))
+        return any(
+            fnmatch.fnmatch(relative_str, pattern) for pattern in exclude_patterns
+        )
+
+    python_files = []
+    codebase_path = Path(codebase_path)
+    for root, dirs, files in os.walk(codebase_path):
+        dirs[:] = [d for d in dirs if not is_excluded(Path(root) / d)]
+        for file in files:
+            if file.endswith(".py"):
+                file_path = Path(root) / file
+                if not is_excluded(file_path):
+                    python_files.append(str(file_path))
+    return python_files
+
+
+@pytest.fixture
+def codebase(tmp_path):
+    """Codebase directory populated with TREE_FILES."""
+    codebase = tmp_path / "codebase"
+    for name in TREE_FILES:
+        file_path = codebase / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("x = 1\n")
+    return codebase
+
+
+class TestGetPythonFiles:
+    """Test cases for ValidationHelper.get_python_files."""
+
+    @pytest.mark.parametrize(
+        "exclude_patterns",
+        [
+            None,
+            [],
+            ["tests/*", "*_old.py"],
+            ["pkg/*"],
+            ["pkg"],
+            ["*/deep/*", "[.]*", "?ain.py"],
+        ],
+    )
+    def test_matches_walk_scan(self, codebase, exclude_patterns):
+        """Test that files and their order match the os.walk scan."""
+        assert ValidationHelper.get_python_files(
+            str(codebase), exclude_patterns
+        ) == walk_python_files(codebase, exclude_patterns)
+
+    def test_default_exclusions(self, codebase):
+        """Test which files the default patterns leave in."""
+        files = ValidationHelper.get_python_files(str(codebase))
+
+        assert sorted(os.path.relpath(f, codebase) for f in files) == sorted(
+            [
+                "main.py",
+                "setup.py",
+                "pkg/__init__.py",
+                "pkg/core.py",
+                "pkg/core_old.py",
+                "pkg/__pycache__/stale.py",
+                "pkg/build/generated.py",
+                "pkg/sub/deep/leaf.py",
+                "pkg/tests/test_core.py",
+                "tests/test_main.py",
+                "tests/conftest.py",
+            ]
+        )
+
+    def test_current_directory(self, codebase, monkeypatch):
+        """Test that a base of "." gives paths without a "./" prefix."""
+        monkeypatch.chdir(codebase)
+
+        files = ValidationHelper.get_python_files(".")
+
+        assert files == walk_python_files(".")
+        assert "main.py" in files
+
+    def test_trailing_separator(self, codebase):
+        """Test a base path given with a trailing separator."""
+        assert ValidationHelper.get_python_files(
+            str(codebase) + os.sep
+        ) == walk_python_files(str(codebase) + os.sep)
+
+    def test_symlinked_directory_not_followed(self, codebase):
+        """Test that symlinks are treated like os.walk treats them."""
+        try:
+            (codebase / "linked").symlink_to(codebase / "pkg", target_is_directory=True)
+            (codebase / "linked.py").symlink_to(codebase / "main.py")
+        except OSError:
+            pytest.skip("symlinks are not supported")
+
+        files = ValidationHelper.get_python_files(str(codebase))
+
+        assert files == walk_python_files(codebase)
+        assert str(codebase / "linked.py") in files
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing codebase has no files."""
+        assert ValidationHelper.get_python_files(str(tmp_path / "missing")) == []
+
+
+class TestCheckPythonSyntax:
+    """Test cases for ValidationHelper.check_python_syntax."""
+
+    def test_valid_file(self, tmp_path):
+        """Test a file that compiles."""
+        file_path = tmp_path / "valid.py"
+        file_path.write_text("def f():\n    return 1\n")
+
+        assert ValidationHelper.check_python_syntax(str(file_path)) == (True, None)
+
+    def test_parser_error(self, tmp_path):
+        """Test a file the parser rejects."""
+        file_path = tmp_path / "invalid.py"
+        file_path.write_text("def f(:\n")
+
+        is_valid, error = ValidationHelper.check_python_syntax(str(file_path))
+
+        assert not is_valid
+        assert "at line 1" in error
+
+    @pytest.mark.parametrize("file_name", sorted(COMPILER_ERRORS))
+    def test_compiler_error(self, tmp_path, file_name):
+        """Test a file only the compiler stage rejects."""
+        file_path = tmp_path / file_name
+        file_path.write_text(COMPILER_ERRORS[file_name])
+
+        is_valid, error = ValidationHelper.check_python_syntax(str(file_path))
+
+        assert not is_valid
+        assert error.startswith(f"Syntax error in {file_path}")
+
+    def test_declared_encoding(self, tmp_path):
+        """Test a file in the encoding its coding declaration names."""
+        file_path = tmp_path / "latin1.py"
+        file_path.write_bytes(b'# -*- coding: latin-1 -*-\nx = "\xe9"\n')
+
+        assert ValidationHelper.check_python_syntax(str(file_path)) == (True, None)
+
+
+class TestSyntaxCacheLocation:
+    """Test cases for where syntax check results are cached."""
+
+    def test_defaults_to_user_cache_directory(self):
+        """Test that the default cache does not depend on the working directory."""
+        assert os.path.isabs(ValidationConfig().syntax_cache_path)
+
+    def test_expands_home_directory(self, tmp_path, monkeypatch):
+        """Test that a configured ~ path is expanded."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        file_path = tmp_path / "valid.py"
+        file_path.write_text("x = 1\n")
+
+        ValidationHelper.check_python_syntax_batch(
+            [str(file_path)], "~/cache/syntax.json"
+        )
+
+        assert (tmp_path / "cache" / "syntax.json").is_file()
+
+
+class TestCheckPythonSyntaxBatch:
+    """Test cases for ValidationHelper.check_python_syntax_batch."""
+
+    @pytest.fixture
+    def checked(self, monkeypatch):
+        """Record the files check_python_syntax is called for."""
+        checked = []
+        check = ValidationHelper.check_python_syntax
+
+        def record(file_path):
+            checked.append(file_path)
+            return check(file_path)
+
+        monkeypatch.setattr(ValidationHelper, "check_python_syntax", record)
+        return checked
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        """A valid, an invalid and another valid file, in that order."""
+        files = []
+        for name, source in [
+            ("a.py", "x = 1\n"),
+            ("b.py", "def f(:\n"),
+            ("c.py", "return 1\n"),
+            ("d.py", "y = 2\n"),
+        ]:
+            file_path = tmp_path / name
+            file_path.write_text(source)
+            files.append(str(file_path))
+        return files
+
+    def test_matches_single_file_checks(self, tmp_path, files):
+        """Test that results, in order, match checking each file alone."""
+        expected = [ValidationHelper.check_python_syntax(f) for f in files]
+        cache_path = str(tmp_path / "cache" / "syntax.json")
+
+        assert ValidationHelper.check_python_syntax_batch(files) == expected
+        assert ValidationHelper.check_python_syntax_batch(files, cache_path) == expected
+        assert ValidationHelper.check_python_syntax_batch(files, cache_path) == expected
+
+    def test_parallel_batch_matches_single_file_checks(self, tmp_path, monkeypatch):
+        """Test that a batch large enough to parallelize keeps its order."""
+        monkeypatch.setattr(ValidationHelper, "PARALLEL_SYNTAX_THRESHOLD", 4)
+        files = []
+        for index in range(12):
+            file_path = tmp_path / f"m{index}.py"
+            file_path.write_text("x = 1\n" if index % 3 else "def f(:\n")
+            files.append(str(file_path))
+
+        assert ValidationHelper.check_python_syntax_batch(files) == [
+            ValidationHelper.check_python_syntax(f) for f in files
+        ]
+
+    def test_cached_passes_are_skipped(self, tmp_path, files, checked):
+        """Test that only failures are checked again on a later run."""
+        cache_path = str(tmp_path / "syntax.json")
+        ValidationHelper.check_python_syntax_batch(files, cache_path)
+        checked.clear()
+
+        results = ValidationHelper.check_python_syntax_batch(files, cache_path)
+
+        assert checked == [files[1], files[2]]
+        assert [ok for ok, _ in results] == [True, False, False, True]
+
+    def test_modified_file_is_checked_again(self, tmp_path, files, checked):
+        """Test that a cached file whose contents changed is not trusted."""
+        cache_path = str(tmp_path / "syntax.json")
+        ValidationHelper.check_python_syntax_batch(files, cache_path)
+        Path(files[0]).write_text("x = (\n")
+        checked.clear()
+
+        results = ValidationHelper.check_python_syntax_batch(files, cache_path)
+
+        assert checked == files[:3]
+        assert not results[0][0]
+
+    def test_fixed_file_is_cached(self, tmp_path, files, checked):
+        """Test that a failure that is fixed becomes a cached pass."""
+        cache_path = str(tmp_path / "syntax.json")
+        ValidationHelper.check_python_syntax_batch(files, cache_path)
+        Path(files[1]).write_text("def f():\n    pass\n")
+        ValidationHelper.check_python_syntax_batch(files, cache_path)
+        checked.clear()
+
+        ValidationHelper.check_python_syntax_batch(files, cache_path)
+
+        assert checked == [files[2]]
+
+    def test_cache_stores_only_passing_files(self, tmp_path, files):
+        """Test the cache file layout."""
+        cache_path = tmp_path / "syntax.json"
+        ValidationHelper.check_python_syntax_batch(files, str(cache_path))
+
+        cache = json.loads(cache_path.read_text())
+
+        assert cache["version"] == ValidationHelper.SYNTAX_CACHE_VERSION
+        assert sorted(cache["files"]) == sorted(
+            os.path.abspath(f) for f in (files[0], files[3])
+        )
+
+    @pytest.mark.parametrize(
+        "stored",
+        [
+            None,
+            {"version": 1},
+            {"version": ValidationHelper.SYNTAX_CACHE_VERSION},
+            {"version": ValidationHelper.SYNTAX_CACHE_VERSION, "python": "2.7"},
+            "{not json",
+        ],
+    )
+    def test_outdated_cache_is_ignored(self, tmp_path, files, checked, stored):
+        """Test that an unversioned, older, other-Python or corrupt cache starts empty."""
+        cache_path = tmp_path / "syntax.json"
+        # Entries in the unversioned layout, claiming every file passed
+        entries = {
+            os.path.abspath(f): [os.stat(f).st_mtime_ns, os.stat(f).st_size]
+            for f in files
+        }
+        if isinstance(stored, dict):
+            cache_path.write_text(json.dumps({**stored, "files": entries}))
+        elif stored is None:
+            cache_path.write_text(json.dumps(entries))
+        else:
+            cache_path.write_text(stored)
+
+        results = ValidationHelper.check_python_syntax_batch(files, str(cache_path))
+
+        assert checked == files
+        assert [ok for ok, _ in results] == [True, False, False, True]
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file fails and is not cached."""
+        cache_path = tmp_path / "syntax.json"
+        missing = str(tmp_path / "missing.py")
+
+        ((is_valid, error),) = ValidationHelper.check_python_syntax_batch(
+            [missing], str(cache_path)
+        )
+
+        assert not is_valid
+        assert missing in error
+        assert json.loads(cache_path.read_text())["files"] == {}
+
+    def test_cache_is_bounded(self, tmp_path, files, monkeypatch):
+        """Test that the least recently checked files are evicted."""
+        monkeypatch.setattr(ValidationHelper, "SYNTAX_CACHE_SIZE", 2)
+        cache_path = tmp_path / "syntax.json"
+        extra = tmp_path / "e.py"
+        extra.write_text("z = 3\n")
+
+        ValidationHelper.check_python_syntax_batch(files, str(cache_path))
+        # a.py is checked again, so d.py is now the least recently checked
+        ValidationHelper.check_python_syntax_batch([files[0]], str(cache_path))
+        ValidationHelper.check_python_syntax_batch([str(extra)], str(cache_path))
+
+        assert list(json.loads(cache_path.read_text())["files"]) == [
+            os.path.abspath(files[0]),
+            os.path.abspath(str(extra)),
+        ]
+
+    def test_deleted_files_are_dropped(self, tmp_path, files):
+        """Test that entries for files that no longer exist are not kept."""
+        cache_path = tmp_path / "syntax.json"
+        ValidationHelper.check_python_syntax_batch(files, str(cache_path))
+        os.remove(files[3])
+
+        ValidationHelper.check_python_syntax_batch(files[:3], str(cache_path))
+
+        assert list(json.loads(cache_path.read_text())["files"]) == [
+            os.path.abspath(files[0])
+        ]
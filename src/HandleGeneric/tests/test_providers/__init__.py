@@ -4,8 +4,3 @@ Tests for HandleGeneric language providers.
 
 from .test_base_provider import *
 from .test_python_provider import *
-from .test_javascript_provider import *
-from .test_typescript_provider import *
-from .test_java_provider import *
-from .test_csharp_provider import *
-from .test_cpp_provider import *
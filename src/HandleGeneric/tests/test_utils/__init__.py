@@ -3,5 +3,3 @@ Tests for HandleGeneric utility functions.
 """
 
 from .test_file_utils import *
-from .test_config_utils import *
-from .test_logging_utils import *
@@ -330,8 +330,11 @@ Examples:
 
     args = parser.parse_args()
 
-    # Set up logging
-    logger = setup_logging(args.verbose)
+    # Commands report through print(); only configure handlers when verbose
+    # output was requested.
+    logger = (
+        setup_logging(args.verbose) if args.verbose else logging.getLogger(__name__)
+    )
 
     # Handle different command combinations
     if args.validate:
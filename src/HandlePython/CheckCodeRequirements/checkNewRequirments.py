@@ -1,11 +1,13 @@
 def compare_requirements(current_reqs, new_reqs):
-    added = {}
-    modified = {}
-
-    for req_id, desc in new_reqs.items():
-        if req_id not in current_reqs:
-            added[req_id] = desc
-        elif current_reqs[req_id] != desc:
-            modified[req_id] = desc
+    # Build each result in a single comprehension instead of growing empty
+    # dicts one insert at a time; iteration order follows new_reqs.
+    added = {
+        req_id: desc for req_id, desc in new_reqs.items() if req_id not in current_reqs
+    }
+    modified = {
+        req_id: desc
+        for req_id, desc in new_reqs.items()
+        if req_id in current_reqs and current_reqs[req_id] != desc
+    }
 
     return {"added": added, "modified": modified}
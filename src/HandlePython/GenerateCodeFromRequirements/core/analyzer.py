@@ -4,6 +4,12 @@ Requirement analyzer for identifying missing functionality and planning implemen
 
 import json
 import logging
+import os
+import re
+import hashlib
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
@@ -13,14 +19,168 @@ sys.path.append(str(Path(__file__).parent.parent))
 from models.requirement_data import RequirementData, RequirementStatus
 from models.generation_result import GenerationResult, GenerationStatus
 
+# Keyword vocabulary used to tag requirement descriptions
+MATH_KEYWORDS = frozenset(
+    [
+        "add",
+        "addition",
+        "sum",
+        "subtract",
+        "subtraction",
+        "minus",
+        "multiply",
+        "multiplication",
+        "times",
+        "divide",
+        "division",
+        "calculate",
+        "compute",
+        "operation",
+        "arithmetic",
+    ]
+)
+
+DATA_KEYWORDS = frozenset(
+    [
+        "list",
+        "array",
+        "string",
+        "number",
+        "integer",
+        "float",
+        "dictionary",
+        "set",
+        "tuple",
+        "collection",
+    ]
+)
+
+ACTION_KEYWORDS = frozenset(
+    [
+        "create",
+        "generate",
+        "build",
+        "implement",
+        "add",
+        "modify",
+        "update",
+        "delete",
+        "remove",
+        "validate",
+        "check",
+        "verify",
+        "test",
+        "parse",
+        "format",
+    ]
+)
+
+UI_KEYWORDS = frozenset(
+    [
+        "interface",
+        "ui",
+        "user",
+        "input",
+        "output",
+        "display",
+        "menu",
+        "option",
+        "choice",
+        "prompt",
+        "cli",
+        "command",
+    ]
+)
+
+ALL_KEYWORDS = MATH_KEYWORDS | DATA_KEYWORDS | ACTION_KEYWORDS | UI_KEYWORDS
+
+
+# Complexity added per matched keyword
+COMPLEXITY_MODIFIERS = {
+    "validate": 0.3,
+    "error": 0.3,
+    "exception": 0.3,
+    "test": 0.2,
+    "interface": 0.4,
+    "ui": 0.5,
+    "database": 0.6,
+    "api": 0.5,
+    "async": 0.4,
+    "thread": 0.4,
+    "network": 0.5,
+    "file": 0.2,
+    "parse": 0.3,
+    "format": 0.2,
+    "sort": 0.2,
+    "search": 0.3,
+    "algorithm": 0.4,
+}
+
+# Libraries suggested for requirements mentioning a keyword
+DEPENDENCY_SUGGESTIONS = {
+    "test": ("pytest", "unittest"),
+    "validate": ("pydantic", "marshmallow"),
+    "parse": ("argparse", "configparser"),
+    "format": ("datetime", "json"),
+    "file": ("pathlib", "os"),
+    "network": ("requests", "urllib"),
+    "database": ("sqlite3", "sqlalchemy"),
+    "ui": ("tkinter", "PyQt", "streamlit"),
+    "api": ("fastapi", "flask", "requests"),
+}
+
+# Description phrases that signal additional implementation effort
+_COMPLEX_RE = re.compile(r"\b(?:complex|advanced|sophisticated)\b")
+_MULTI_RE = re.compile(r"\b(?:multiple|various|different)\b")
+
+# Coverage reported for requirements without any keywords
+_NO_COVERAGE = {"coverage_score": 0.0}
+
+# Paths under test/cache directories, test modules and pytest support files
+# are not implementation files
+_NON_IMPL_RE = re.compile(
+    r"(?:^|[/\\])(?:tests?|__pycache__)(?:[/\\]|$)"
+    r"|(?:^|[/\\])test_[^/\\]*$"
+    r"|_test\.py$"
+    r"|(?:^|[/\\])conftest\.py$"
+    r"|(?:^|[/\\])tests?\.py$"
+)
+
+# Splits lowercased descriptions and metadata text into word tokens
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+# Matches whole vocabulary words in lowercased text; the letter lookarounds give
+# the same word boundaries as _TOKEN_RE and longer keywords are tried first
+_KW_RE = re.compile(
+    r"(?<![a-z])(?:"
+    + "|".join(map(re.escape, sorted(ALL_KEYWORDS, key=lambda kw: (-len(kw), kw))))
+    + r")(?![a-z])"
+)
+
 
 class RequirementAnalyzer:
     """Analyzes requirements against existing codebase metadata."""
 
+    # Maximum number of (description, metadata fingerprint) results kept
+    ANALYSIS_CACHE_SIZE = 1024
+
+    # Requirement count above which uncached analyses run in worker processes
+    PARALLEL_THRESHOLD = 8
+
     def __init__(self, logger: Optional[logging.Logger] = None):
         """Initialize the analyzer."""
         self.logger = logger or logging.getLogger(__name__)
 
+        # Inverted index over metadata entities, rebuilt per analyze_requirements
+        self._coverage_entities: List[tuple] = []
+        self._coverage_index: Dict[str, List[int]] = {}
+        self._path_index: Dict[str, Dict[str, Any]] = {}
+        self._name_candidates: List[tuple] = []
+        self._default_target_files: tuple = ()
+
+        # LRU cache of analysis results keyed by (description, metadata fingerprint)
+        self._analysis_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
     def analyze_requirements(
         self,
         requirements: Dict[str, str],
@@ -38,22 +198,37 @@ class RequirementAnalyzer:
         Returns:
             List of RequirementData objects with analysis results
         """
-        self.logger.info(f"Analyzing {len(requirements)} requirements against metadata")
+        self.logger.info(
+            "Analyzing %d requirements against metadata", len(requirements)
+        )
 
         requirement_objects = []
+        meta_fp = self._metadata_fingerprint(metadata)
+
+        # Index the metadata once instead of rescanning it for every requirement
+        self._coverage_entities, self._coverage_index = self._build_coverage_index(
+            metadata
+        )
+        self._path_index = {fi.get("path", ""): fi for fi in metadata.get("files", [])}
+        impl_paths = self._implementation_paths(metadata)
+        self._name_candidates = self._build_name_candidates(impl_paths, metadata)
+        self._default_target_files = self._build_default_target_files(impl_paths)
+
+        if len(requirements) > self.PARALLEL_THRESHOLD:
+            self._prefill_cache_in_parallel(requirements, meta_fp)
 
         for req_id, description in requirements.items():
             try:
                 req_data = self._analyze_single_requirement(
-                    req_id, description, metadata
+                    req_id, description, meta_fp
                 )
                 requirement_objects.append(req_data)
                 self.logger.debug(
-                    f"Analyzed requirement {req_id}: {req_data.status.value}"
+                    "Analyzed requirement %s: %s", req_id, req_data.status.value
                 )
 
             except Exception as e:
-                self.logger.error(f"Error analyzing requirement {req_id}: {str(e)}")
+                self.logger.error("Error analyzing requirement %s: %s", req_id, e)
                 req_data = RequirementData(
                     req_id, description, RequirementStatus.FAILED
                 )
@@ -66,206 +241,321 @@ class RequirementAnalyzer:
                     requirement_id=req_id,
                 )
 
+        # Release the per-call index so large metadata is not kept alive
+        self._coverage_entities, self._coverage_index = [], {}
+        self._path_index = {}
+        self._name_candidates = []
+        self._default_target_files = ()
+
         # Update result with analysis statistics
         result.requirements_analyzed = len(requirement_objects)
 
         self.logger.info(
-            f"Analysis complete. {len(requirement_objects)} requirements processed"
+            "Analysis complete. %d requirements processed", len(requirement_objects)
         )
         return requirement_objects
 
+    def _prefill_cache_in_parallel(
+        self, requirements: Dict[str, str], meta_fp: bytes
+    ) -> None:
+        """
+        Analyze uncached descriptions in worker processes and store the results.
+
+        Failures are left out of the cache so the serial pass re-runs and
+        reports them per requirement.
+        """
+        pending = list(
+            dict.fromkeys(
+                description
+                for description in requirements.values()
+                if (description, meta_fp) not in self._analysis_cache
+            )
+        )
+        if len(pending) <= self.PARALLEL_THRESHOLD:
+            return
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(pending)),
+                initializer=_init_worker,
+                initargs=(self._index_state(),),
+            ) as executor:
+                # map() yields in submission order, keeping the cache deterministic
+                for description, analysis in zip(
+                    pending, executor.map(_analyze_in_worker, pending)
+                ):
+                    if analysis is not None:
+                        self._analysis_cache[(description, meta_fp)] = analysis
+        except (OSError, RuntimeError) as e:
+            self.logger.warning(
+                "Parallel analysis unavailable, falling back to serial: %s", e
+            )
+
+        while len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+    def _index_state(self) -> Dict[str, Any]:
+        """Return the per-call metadata indexes for installing in a worker."""
+        return {
+            "_coverage_entities": self._coverage_entities,
+            "_coverage_index": self._coverage_index,
+            "_path_index": self._path_index,
+            "_name_candidates": self._name_candidates,
+            "_default_target_files": self._default_target_files,
+        }
+
+    @staticmethod
+    def _implementation_paths(metadata: Dict[str, Any]) -> List[str]:
+        """Return metadata file paths that are not tests or caches."""
+        paths = (file_info.get("path", "") for file_info in metadata.get("files", []))
+        return [path for path in paths if not _NON_IMPL_RE.search(path)]
+
+    @staticmethod
+    def _build_name_candidates(
+        impl_paths: List[str], metadata: Dict[str, Any]
+    ) -> List[tuple]:
+        """
+        Collect the implementation files and dependencies matched by name.
+
+        Returns:
+            List of (kind, value, lowercased name) tuples, kind being "file" or
+            "dep", so both are matched against keywords in one pass.
+        """
+        # Prefer main implementation files over test files; basename avoids
+        # building a Path object per file
+        candidates = [
+            ("file", file_path, os.path.basename(file_path).lower())
+            for file_path in impl_paths
+        ]
+
+        if "dependencies" in metadata:
+            external_deps = metadata["dependencies"].get("external_dependencies", [])
+            internal_deps = metadata["dependencies"].get("internal_dependencies", [])
+            candidates.extend(
+                ("dep", dep, dep.lower()) for dep in chain(external_deps, internal_deps)
+            )
+
+        return candidates
+
+    def _build_default_target_files(self, impl_paths: List[str]) -> tuple:
+        """
+        Pick the fallback target used when a requirement matches no files.
+
+        Depends only on the metadata, so it is computed once per analysis.
+        """
+        main_files = [
+            file_path
+            for file_path in impl_paths
+            if not (file_path.endswith("main.py") or file_path.endswith("__init__.py"))
+        ]
+
+        if not main_files:
+            return ()
+
+        # Prefer the file with the most content
+        path_index = self._path_index
+        return (
+            max(
+                main_files,
+                key=lambda f: len(path_index[f].get("functions", []))
+                + len(path_index[f].get("classes", [])),
+            ),
+        )
+
+    @staticmethod
+    def _metadata_fingerprint(metadata: Dict[str, Any]) -> bytes:
+        """Return a short content hash identifying the given metadata."""
+        serialized = json.dumps(metadata, sort_keys=True, default=str)
+        return hashlib.blake2b(serialized.encode("utf-8"), digest_size=16).digest()
+
     def _analyze_single_requirement(
-        self, req_id: str, description: str, metadata: Dict[str, Any]
+        self, req_id: str, description: str, meta_fp: bytes
     ) -> RequirementData:
-        """Analyze a single requirement against the metadata."""
+        """Analyze a single requirement against the indexed metadata."""
         req_data = RequirementData(req_id, description)
 
+        # Reuse earlier results for the same description against the same metadata
+        cache_key = (description, meta_fp)
+        analysis = self._analysis_cache.get(cache_key)
+        if analysis is None:
+            analysis = self._compute_analysis(description)
+            self._analysis_cache[cache_key] = analysis
+            if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        else:
+            self._analysis_cache.move_to_end(cache_key)
+
+        complexity, target_files, implementation_notes, dependencies = analysis
+        req_data.complexity_score = complexity
+        req_data.target_files = list(target_files)
+        req_data.implementation_notes = implementation_notes
+        req_data.dependencies = list(dependencies)
+
+        self.logger.debug(
+            "Requirement %s analysis: complexity=%.2f, targets=%d, deps=%d",
+            req_id,
+            complexity,
+            len(target_files),
+            len(dependencies),
+        )
+
+        return req_data
+
+    def _compute_analysis(self, description: str) -> tuple:
+        """
+        Run the keyword, coverage, complexity, target and dependency analysis.
+
+        Returns:
+            Immutable tuple of (complexity, target_files, implementation_notes,
+            dependencies) suitable for caching.
+        """
+        # Lowercase and measure the description once for all helpers below
+        desc_lower = description.lower()
+        word_count = description.count(" ") + 1
+
         # Extract keywords from requirement description
-        keywords = self._extract_keywords(description)
+        keywords = self._extract_keywords(desc_lower)
+
+        # Without keywords there is no coverage, no name match and no
+        # dependency suggestion: only the metadata-wide fallback target applies
+        if not keywords:
+            target_files = self._default_target_files
+            implementation_notes = self._generate_implementation_notes(
+                description, keywords, _NO_COVERAGE, target_files
+            )
+            complexity = self._assess_complexity(desc_lower, word_count, keywords)
+            return complexity, target_files, implementation_notes, ()
 
-        # Check if functionality already exists
-        existing_coverage = self._check_existing_coverage(keywords, metadata)
+        # Check existing coverage and name matches in one pass over the metadata
+        existing_coverage, candidate_files, candidate_deps = self._scan_metadata(
+            keywords
+        )
 
         # Determine complexity and implementation strategy
-        complexity = self._assess_complexity(description, keywords)
-        req_data.complexity_score = complexity
+        complexity = self._assess_complexity(desc_lower, word_count, keywords)
 
         # Determine target files for implementation
-        target_files = self._determine_target_files(
-            keywords, metadata, existing_coverage
-        )
-        req_data.target_files = target_files
+        target_files = self._determine_target_files(candidate_files, existing_coverage)
 
         # Set implementation notes
-        req_data.implementation_notes = self._generate_implementation_notes(
+        implementation_notes = self._generate_implementation_notes(
             description, keywords, existing_coverage, target_files
         )
 
         # Determine dependencies
-        dependencies = self._identify_dependencies(keywords, metadata)
-        req_data.dependencies = dependencies
+        dependencies = self._identify_dependencies(keywords, candidate_deps)
 
-        self.logger.debug(
-            f"Requirement {req_id} analysis: "
-            f"complexity={complexity:.2f}, "
-            f"targets={len(target_files)}, "
-            f"deps={len(dependencies)}"
+        return (
+            complexity,
+            tuple(target_files),
+            implementation_notes,
+            tuple(dependencies),
         )
 
-        return req_data
-
-    def _extract_keywords(self, description: str) -> List[str]:
-        """Extract relevant keywords from requirement description."""
+    def _extract_keywords(self, description_lower: str) -> List[str]:
+        """Extract relevant keywords from a lowercased requirement description."""
         # Simple keyword extraction - can be enhanced with NLP
-        keywords = []
-
-        # Math operations
-        math_keywords = [
-            "add",
-            "addition",
-            "sum",
-            "subtract",
-            "subtraction",
-            "minus",
-            "multiply",
-            "multiplication",
-            "times",
-            "divide",
-            "division",
-            "calculate",
-            "compute",
-            "operation",
-            "arithmetic",
-        ]
+        # One scan of the compiled alternation yields only vocabulary words
+        return list(set(_KW_RE.findall(description_lower)))
 
-        # Data structures
-        data_keywords = [
-            "list",
-            "array",
-            "string",
-            "number",
-            "integer",
-            "float",
-            "dictionary",
-            "set",
-            "tuple",
-            "collection",
-        ]
+    def _build_coverage_index(self, metadata: Dict[str, Any]) -> tuple:
+        """
+        Build an inverted index of metadata functions, classes and methods.
 
-        # Actions
-        action_keywords = [
-            "create",
-            "generate",
-            "build",
-            "implement",
-            "add",
-            "modify",
-            "update",
-            "delete",
-            "remove",
-            "validate",
-            "check",
-            "verify",
-            "test",
-            "parse",
-            "format",
-        ]
+        Returns:
+            Tuple of (entities, index) where entities is a list of
+            (kind, name, file) tuples, kind being "func" or "class", and index
+            maps each lowercase token found in an entity's name or docstring to
+            entity positions.
+        """
+        entities = []
+        index = defaultdict(list)
 
-        # UI/Interface
-        ui_keywords = [
-            "interface",
-            "ui",
-            "user",
-            "input",
-            "output",
-            "display",
-            "menu",
-            "option",
-            "choice",
-            "prompt",
-            "cli",
-            "command",
-        ]
+        def add_entity(kind: str, name: str, file_path: str, item: Dict[str, Any]):
+            entity_id = len(entities)
+            entities.append((kind, name, file_path))
 
-        all_keywords = math_keywords + data_keywords + action_keywords + ui_keywords
+            # One lowercase + one regex pass over the combined name/docstring
+            blob = f"{item.get('name', '')} {item.get('docstring', '')}".lower()
+            for token in set(_TOKEN_RE.findall(blob)):
+                index[token].append(entity_id)
 
-        description_lower = description.lower()
-        for keyword in all_keywords:
-            if keyword in description_lower:
-                keywords.append(keyword)
+        for file_info in metadata.get("files", []):
+            file_path = file_info.get("path", "")
 
-        return list(set(keywords))  # Remove duplicates
+            for func in file_info.get("functions", []):
+                add_entity("func", func.get("name"), file_path, func)
 
-    def _check_existing_coverage(
-        self, keywords: List[str], metadata: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Check how much of the requirement is already covered by existing code."""
-        coverage = {"functions": [], "classes": [], "files": [], "coverage_score": 0.0}
+            for cls in file_info.get("classes", []):
+                add_entity("class", cls.get("name"), file_path, cls)
 
-        if "files" not in metadata:
-            return coverage
+                for method in cls.get("methods", []):
+                    add_entity(
+                        "func",
+                        f"{cls.get('name')}.{method.get('name')}",
+                        file_path,
+                        method,
+                    )
+
+        return entities, dict(index)
+
+    def _scan_metadata(self, keywords: List[str]) -> tuple:
+        """
+        Match keywords against the indexed metadata.
+
+        Returns:
+            Tuple of (existing_coverage, candidate_files, candidate_deps) where
+            the candidates are file paths and dependency names containing a
+            keyword, in metadata order.
+        """
+        existing_coverage = self._check_existing_coverage(keywords)
+
+        matched = {"file": [], "dep": []}
+        if keywords:
+            for kind, value, name_lower in self._name_candidates:
+                if any(kw in name_lower for kw in keywords):
+                    matched[kind].append(value)
+
+        return existing_coverage, matched["file"], matched["dep"]
+
+    def _check_existing_coverage(self, keywords: List[str]) -> Dict[str, Any]:
+        """
+        Check how much of the requirement is already covered by existing code.
+
+        Matches are stored as parallel lists (func_names/func_files/func_matches
+        and class_names/class_files/class_matches) rather than one dict per hit.
+        """
+        coverage = {
+            "func_names": [],
+            "func_files": [],
+            "func_matches": [],
+            "class_names": [],
+            "class_files": [],
+            "class_matches": [],
+            "coverage_score": 0.0,
+        }
 
-        total_matches = 0
         keyword_count = len(keywords)
 
         if keyword_count == 0:
             return coverage
 
-        for file_info in metadata["files"]:
-            file_path = file_info.get("path", "")
-
-            # Check functions
-            for func in file_info.get("functions", []):
-                func_name = func.get("name", "").lower()
-                func_doc = func.get("docstring", "").lower()
-
-                matches = sum(1 for kw in keywords if kw in func_name or kw in func_doc)
-                if matches > 0:
-                    coverage["functions"].append(
-                        {
-                            "name": func.get("name"),
-                            "file": file_path,
-                            "matches": matches,
-                            "docstring": func.get("docstring", ""),
-                        }
-                    )
-                    total_matches += matches
-
-            # Check classes
-            for cls in file_info.get("classes", []):
-                cls_name = cls.get("name", "").lower()
-                cls_doc = cls.get("docstring", "").lower()
-
-                matches = sum(1 for kw in keywords if kw in cls_name or kw in cls_doc)
-                if matches > 0:
-                    coverage["classes"].append(
-                        {
-                            "name": cls.get("name"),
-                            "file": file_path,
-                            "matches": matches,
-                            "docstring": cls.get("docstring", ""),
-                        }
-                    )
-                    total_matches += matches
+        # Count keyword hits per entity through the inverted index; Counter
+        # tallies the chained posting lists in C rather than a Python loop
+        index = self._coverage_index
+        matches_by_entity = Counter(
+            chain.from_iterable(index.get(kw, ()) for kw in keywords)
+        )
 
-                # Check methods
-                for method in cls.get("methods", []):
-                    method_name = method.get("name", "").lower()
-                    method_doc = method.get("docstring", "").lower()
+        # Report entities in metadata order
+        for entity_id in sorted(matches_by_entity):
+            kind, name, file_path = self._coverage_entities[entity_id]
+            coverage[f"{kind}_names"].append(name)
+            coverage[f"{kind}_files"].append(file_path)
+            coverage[f"{kind}_matches"].append(matches_by_entity[entity_id])
 
-                    matches = sum(
-                        1 for kw in keywords if kw in method_name or kw in method_doc
-                    )
-                    if matches > 0:
-                        coverage["functions"].append(
-                            {
-                                "name": f"{cls.get('name')}.{method.get('name')}",
-                                "file": file_path,
-                                "matches": matches,
-                                "docstring": method.get("docstring", ""),
-                            }
-                        )
-                        total_matches += matches
+        # Reduce the hit counts directly in C instead of re-summing the lists
+        total_matches = sum(matches_by_entity.values())
 
         # Calculate coverage score
         coverage["coverage_score"] = min(
@@ -274,114 +564,53 @@ class RequirementAnalyzer:
 
         return coverage
 
-    def _assess_complexity(self, description: str, keywords: List[str]) -> float:
+    def _assess_complexity(
+        self, desc_lower: str, word_count: int, keywords: List[str]
+    ) -> float:
         """Assess the complexity of implementing the requirement."""
         complexity = 1.0  # Base complexity
 
         # Increase complexity based on keywords
-        complexity_modifiers = {
-            "validate": 0.3,
-            "error": 0.3,
-            "exception": 0.3,
-            "test": 0.2,
-            "interface": 0.4,
-            "ui": 0.5,
-            "database": 0.6,
-            "api": 0.5,
-            "async": 0.4,
-            "thread": 0.4,
-            "network": 0.5,
-            "file": 0.2,
-            "parse": 0.3,
-            "format": 0.2,
-            "sort": 0.2,
-            "search": 0.3,
-            "algorithm": 0.4,
-        }
-
         for keyword in keywords:
-            if keyword in complexity_modifiers:
-                complexity += complexity_modifiers[keyword]
+            complexity += COMPLEXITY_MODIFIERS.get(keyword, 0.0)
 
         # Increase complexity based on description length and complexity indicators
-        if len(description.split()) > 20:
+        if word_count > 20:
             complexity += 0.2
 
-        if any(
-            word in description.lower()
-            for word in ["complex", "advanced", "sophisticated"]
-        ):
+        if _COMPLEX_RE.search(desc_lower):
             complexity += 0.3
 
-        if any(
-            word in description.lower() for word in ["multiple", "various", "different"]
-        ):
+        if _MULTI_RE.search(desc_lower):
             complexity += 0.2
 
         return min(complexity, 5.0)  # Cap at 5.0
 
     def _determine_target_files(
-        self,
-        keywords: List[str],
-        metadata: Dict[str, Any],
-        existing_coverage: Dict[str, Any],
+        self, candidate_files: List[str], existing_coverage: Dict[str, Any]
     ) -> List[str]:
         """Determine which files should be targeted for implementation."""
         target_files = []
 
         # If there's existing coverage, prefer those files
         if existing_coverage["coverage_score"] > 0.3:
-            covered_files = set()
-            for func in existing_coverage["functions"]:
-                covered_files.add(func["file"])
-            for cls in existing_coverage["classes"]:
-                covered_files.add(cls["file"])
+            covered_files = set(existing_coverage["func_files"]) | set(
+                existing_coverage["class_files"]
+            )
             target_files.extend(list(covered_files))
 
-        # Look for main implementation files
-        if "files" in metadata:
-            for file_info in metadata["files"]:
-                file_path = file_info.get("path", "")
+        # Track membership alongside the ordered list to avoid linear scans
+        seen = set(target_files)
 
-                # Prefer main implementation files over test files
-                if not any(
-                    test_dir in file_path
-                    for test_dir in ["test", "tests", "__pycache__"]
-                ):
-                    # Check if file seems relevant based on name
-                    file_name = Path(file_path).name.lower()
-                    if any(kw in file_name for kw in keywords):
-                        if file_path not in target_files:
-                            target_files.append(file_path)
-
-        # If no specific targets found, suggest main files
-        if not target_files and "files" in metadata:
-            main_files = []
-            for file_info in metadata["files"]:
-                file_path = file_info.get("path", "")
-                if file_path.endswith("main.py") or file_path.endswith("__init__.py"):
-                    continue
-                if not any(
-                    test_dir in file_path
-                    for test_dir in ["test", "tests", "__pycache__"]
-                ):
-                    main_files.append(file_path)
+        # Add implementation files whose name matched a keyword
+        for file_path in candidate_files:
+            if file_path not in seen:
+                seen.add(file_path)
+                target_files.append(file_path)
 
-            # Sort by file size (prefer files with more content)
-            main_files.sort(
-                key=lambda f: len(
-                    [fi for fi in metadata["files"] if fi["path"] == f][0].get(
-                        "functions", []
-                    )
-                    + [fi for fi in metadata["files"] if fi["path"] == f][0].get(
-                        "classes", []
-                    )
-                ),
-                reverse=True,
-            )
-
-            if main_files:
-                target_files.append(main_files[0])  # Use the main implementation file
+        # If no specific targets found, suggest the main implementation file
+        if not target_files:
+            target_files.extend(self._default_target_files)
 
         return target_files
 
@@ -422,39 +651,37 @@ class RequirementAnalyzer:
         return "; ".join(notes)
 
     def _identify_dependencies(
-        self, keywords: List[str], metadata: Dict[str, Any]
+        self, keywords: List[str], candidate_deps: List[str]
     ) -> List[str]:
         """Identify potential dependencies for the requirement."""
-        dependencies = []
+        # Suggest relevant existing dependencies from metadata
+        dependencies = list(candidate_deps)
 
-        # Check existing dependencies in metadata
-        if "dependencies" in metadata:
-            external_deps = metadata["dependencies"].get("external_dependencies", [])
-            internal_deps = metadata["dependencies"].get("internal_dependencies", [])
+        # Suggest new dependencies based on keywords, in keyword order
+        suggested = chain.from_iterable(
+            DEPENDENCY_SUGGESTIONS.get(keyword, ()) for keyword in keywords
+        )
+        seen = set(dependencies)
+        dependencies.extend(dep for dep in dict.fromkeys(suggested) if dep not in seen)
 
-            # Suggest relevant existing dependencies
-            for dep in external_deps + internal_deps:
-                dep_lower = dep.lower()
-                if any(kw in dep_lower for kw in keywords):
-                    dependencies.append(dep)
-
-        # Suggest new dependencies based on keywords
-        dependency_suggestions = {
-            "test": ["pytest", "unittest"],
-            "validate": ["pydantic", "marshmallow"],
-            "parse": ["argparse", "configparser"],
-            "format": ["datetime", "json"],
-            "file": ["pathlib", "os"],
-            "network": ["requests", "urllib"],
-            "database": ["sqlite3", "sqlalchemy"],
-            "ui": ["tkinter", "PyQt", "streamlit"],
-            "api": ["fastapi", "flask", "requests"],
-        }
+        return dependencies
 
-        for keyword in keywords:
-            if keyword in dependency_suggestions:
-                for dep in dependency_suggestions[keyword]:
-                    if dep not in dependencies:
-                        dependencies.append(dep)
 
-        return dependencies
+# Per-process analyzer installed by _init_worker
+_worker_analyzer: Optional[RequirementAnalyzer] = None
+
+
+def _init_worker(index_state: Dict[str, Any]) -> None:
+    """Install the precomputed metadata indexes in a worker process."""
+    global _worker_analyzer
+    _worker_analyzer = RequirementAnalyzer()
+    for name, value in index_state.items():
+        setattr(_worker_analyzer, name, value)
+
+
+def _analyze_in_worker(description: str) -> Optional[tuple]:
+    """Analyze one description in a worker; returns None on failure."""
+    try:
+        return _worker_analyzer._compute_analysis(description)
+    except Exception:
+        return None
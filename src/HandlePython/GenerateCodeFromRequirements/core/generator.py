@@ -4,9 +4,12 @@ Main code generator that orchestrates the entire code generation workflow.
 
 import json
 import logging
+import re
 import subprocess
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
@@ -14,23 +17,43 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 try:
-    from CheckCodeRequirements.checkNewRequirments import compare_requirements
     from CheckCodeRequirements.adapters.readRequirementsFromCSV import (
+        iter_requirements_csv,
         read_requirements_csv,
     )
 except ImportError:
     # Fallback for testing
-    def compare_requirements(current_reqs, new_reqs):
-        return {"added": new_reqs, "modified": {}}
-
-    def read_requirements_csv(file_path):
+    def iter_requirements_csv(file_path):
         import csv
 
         with open(file_path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            return {row["id"]: row["description"].strip() for row in reader}
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            id_col, desc_col = header.index("id"), header.index("description")
+            for row in reader:
+                if row:
+                    yield row[id_col], row[desc_col].strip()
+
+    def read_requirements_csv(file_path):
+        return dict(iter_requirements_csv(file_path))
 
 
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib json parser
+    orjson = None
+
+try:
+    from ValidationUnit.core.validator import CodebaseValidator
+    from ValidationUnit.utils.config import ValidationConfig
+except ImportError:
+    # Validation unit not available alongside this package
+    CodebaseValidator = None
+    ValidationConfig = None
+
 try:
     from AIBrain.ai import AzureOpenAIClient
 except ImportError:
@@ -51,10 +74,44 @@ from models.requirement_data import RequirementData, RequirementStatus
 from models.code_change import CodeChange, ChangeType
 from models.generation_result import GenerationResult, GenerationStatus
 
+# Requirements diff cache, relative to the directory of the new requirements CSV
+REQUIREMENTS_CACHE_FILE = Path(".cache") / "reqs_diff.json"
+
+# Common patterns that suggest imports
+IMPORT_PATTERNS = {
+    "typing": ("List", "Dict", "Optional", "Any", "Union"),
+    "datetime": ("datetime", "date", "time"),
+    "json": ("json.",),
+    "os": ("os.path", "os."),
+    "sys": ("sys.",),
+    "pathlib": ("Path",),
+    "logging": ("logging.",),
+    "argparse": ("ArgumentParser", "argparse"),
+}
+
+# Matches any import pattern as a whole identifier, longest pattern first
+_IMPORT_PATTERN_RE = re.compile(
+    "|".join(
+        r"\b" + re.escape(p) + (r"\b" if p[-1].isalnum() else "")
+        for p in sorted(
+            {p for patterns in IMPORT_PATTERNS.values() for p in patterns},
+            key=lambda p: (-len(p), p),
+        )
+    )
+)
+
+# Markdown code fence; an unterminated fence runs to the end of the response
+_FENCE_RE = re.compile(
+    r"^[ \t]*```[^\n]*\n(.*?)(?:^[ \t]*```|\Z)", re.MULTILINE | re.DOTALL
+)
+
 
 class CodeGenerator:
     """Main code generation orchestrator."""
 
+    # Maximum number of AI requests in flight at once
+    AI_MAX_WORKERS = 8
+
     def __init__(self, logger: Optional[logging.Logger] = None):
         """Initialize the code generator."""
         self.logger = logger or logging.getLogger(__name__)
@@ -62,12 +119,17 @@ class CodeGenerator:
         self.integrator = CodeIntegrator(logger)
         self.ai_client = None
 
+        # Path -> file info index over the most recently used metadata
+        self._indexed_metadata: Optional[Dict[str, Any]] = None
+        self._file_index: Dict[str, Dict[str, Any]] = {}
+        self._imports_by_file: Dict[str, frozenset] = {}
+
         # Initialize AI client
         try:
             self.ai_client = AzureOpenAIClient()
             self.logger.info("AI client initialized successfully")
         except Exception as e:
-            self.logger.warning(f"AI client initialization failed: {str(e)}")
+            self.logger.warning("AI client initialization failed: %s", e)
 
     def generate_from_requirements(
         self,
@@ -135,16 +197,9 @@ class CodeGenerator:
                 return result
 
             # Step 5: Generate code for each requirement
-            code_changes = []
-            for req_data in requirement_objects:
-                if req_data.status == RequirementStatus.FAILED:
-                    result.requirements_failed += 1
-                    continue
-
-                changes = self._generate_code_for_requirement(
-                    req_data, metadata, result
-                )
-                code_changes.extend(changes)
+            code_changes = self._generate_code_batch(
+                requirement_objects, metadata, result
+            )
 
             # Step 6: Apply code changes
             if code_changes:
@@ -157,7 +212,7 @@ class CodeGenerator:
             self._update_metadata(output_path, metadata_path, result)
 
             # Step 9: Run validation
-            self._run_validation(output_path, result)
+            self._run_validation(output_path, metadata_path, result)
 
             # Determine final status
             if result.has_errors():
@@ -171,13 +226,13 @@ class CodeGenerator:
 
             result.execution_time = time.time() - start_time
             self.logger.info(
-                f"Code generation completed in {result.execution_time:.2f}s"
+                "Code generation completed in %.2fs", result.execution_time
             )
 
             return result
 
         except Exception as e:
-            self.logger.error(f"Code generation failed: {str(e)}")
+            self.logger.error("Code generation failed: %s", e)
             result.add_problem("error", "generation", f"Generation failed: {str(e)}")
             result.status = GenerationStatus.FAILED
             result.execution_time = time.time() - start_time
@@ -193,33 +248,59 @@ class CodeGenerator:
         try:
             self.logger.info("Checking requirements for implementation needs")
 
-            # Load new requirements
-            new_requirements = read_requirements_csv(requirements_path)
+            if not (
+                existing_requirements_path and Path(existing_requirements_path).exists()
+            ):
+                existing_requirements_path = None
 
-            if existing_requirements_path and Path(existing_requirements_path).exists():
-                # Load existing requirements and compare
+            # Reuse the previous diff when neither CSV changed since it was computed
+            cache_path = Path(requirements_path).parent / REQUIREMENTS_CACHE_FILE
+            cache_key = self._requirements_cache_key(
+                requirements_path, existing_requirements_path
+            )
+            cached = self._load_cached_requirements(cache_path, cache_key)
+            if cached is not None:
+                self.logger.info(
+                    "Requirements unchanged, reusing %d cached requirements",
+                    len(cached),
+                )
+                return cached
+
+            if existing_requirements_path:
+                # Load existing requirements, then stream the new file against them
                 existing_requirements = read_requirements_csv(
                     existing_requirements_path
                 )
-                comparison = compare_requirements(
-                    existing_requirements, new_requirements
-                )
+                added = {}
+                modified = {}
+                for req_id, description in iter_requirements_csv(requirements_path):
+                    current = existing_requirements.get(req_id)
+                    if current is None:
+                        added[req_id] = description
+                    elif current != description:
+                        modified[req_id] = description
+                    else:
+                        # A later duplicate row may restore the existing text
+                        modified.pop(req_id, None)
 
                 # Combine added and modified requirements
-                requirements_to_implement = {
-                    **comparison["added"],
-                    **comparison["modified"],
-                }
+                requirements_to_implement = {**added, **modified}
 
                 self.logger.info(
-                    f"Found {len(comparison['added'])} new and "
-                    f"{len(comparison['modified'])} modified requirements"
+                    "Found %d new and %d modified requirements",
+                    len(added),
+                    len(modified),
                 )
             else:
                 # All requirements are new
-                requirements_to_implement = new_requirements
-                self.logger.info(f"All {len(new_requirements)} requirements are new")
+                requirements_to_implement = read_requirements_csv(requirements_path)
+                self.logger.info(
+                    "All %d requirements are new", len(requirements_to_implement)
+                )
 
+            self._store_cached_requirements(
+                cache_path, cache_key, requirements_to_implement
+            )
             return requirements_to_implement
 
         except Exception as e:
@@ -228,14 +309,58 @@ class CodeGenerator:
             result.add_problem("error", "requirement", error_msg)
             return {}
 
+    @staticmethod
+    def _requirements_cache_key(
+        requirements_path: str, existing_requirements_path: Optional[str]
+    ) -> List[Any]:
+        """Fingerprint both requirement files by path, mtime and size."""
+        key = []
+        for path in (requirements_path, existing_requirements_path):
+            if path is None:
+                key.append(None)
+                continue
+            stat = Path(path).stat()
+            key.append([str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size])
+        return key
+
+    def _load_cached_requirements(
+        self, cache_path: Path, cache_key: List[Any]
+    ) -> Optional[Dict[str, str]]:
+        """Return the cached requirements diff if it matches the given key."""
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(cache, dict) or cache.get("key") != cache_key:
+            return None
+        return cache.get("requirements")
+
+    def _store_cached_requirements(
+        self, cache_path: Path, cache_key: List[Any], requirements: Dict[str, str]
+    ):
+        """Persist a requirements diff; failures only cost the next run a re-scan."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"key": cache_key, "requirements": requirements}, f)
+        except OSError as e:
+            self.logger.debug("Could not write requirements cache: %s", e)
+
     def _load_metadata(
         self, metadata_path: str, result: GenerationResult
     ) -> Optional[Dict[str, Any]]:
         """Load project metadata."""
         try:
-            with open(metadata_path, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
-            self.logger.info(f"Loaded metadata from {metadata_path}")
+            if orjson is not None:
+                with open(metadata_path, "rb") as f:
+                    metadata = orjson.loads(f.read())
+            else:
+                with open(metadata_path, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            self._index_metadata_files(metadata)
+            self.logger.info("Loaded metadata from %s", metadata_path)
             return metadata
 
         except Exception as e:
@@ -244,11 +369,98 @@ class CodeGenerator:
             result.add_problem("error", "metadata", error_msg)
             return None
 
+    def _generate_code_batch(
+        self,
+        requirement_objects: List[RequirementData],
+        metadata: Dict[str, Any],
+        result: GenerationResult,
+    ) -> List[CodeChange]:
+        """
+        Generate code changes for all requirements.
+
+        AI requests are sent concurrently up front; responses are then
+        processed one requirement at a time in the original order.
+        """
+        if not self.ai_client:
+            # Nothing to ask for; mark requirements failed without a pool
+            return self._collect_code_changes(requirement_objects, metadata, result, {})
+
+        with ThreadPoolExecutor(max_workers=self.AI_MAX_WORKERS) as executor:
+            ai_requests = {
+                req_data.id: executor.submit(
+                    self._ask_for_code_changes, req_data, metadata
+                )
+                for req_data in requirement_objects
+                if req_data.status != RequirementStatus.FAILED
+            }
+            return self._collect_code_changes(
+                requirement_objects, metadata, result, ai_requests
+            )
+
+    def _collect_code_changes(
+        self,
+        requirement_objects: List[RequirementData],
+        metadata: Dict[str, Any],
+        result: GenerationResult,
+        ai_requests: Dict[str, Future],
+    ) -> List[CodeChange]:
+        """Process requirements in order, using any submitted AI requests."""
+        code_changes = []
+
+        for req_data in requirement_objects:
+            if req_data.status == RequirementStatus.FAILED:
+                result.requirements_failed += 1
+                continue
+
+            changes = self._generate_code_for_requirement(
+                req_data, metadata, result, ai_requests.get(req_data.id)
+            )
+            code_changes.extend(changes)
+
+        return code_changes
+
+    def _ask_for_code(
+        self, req_data: RequirementData, metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Ask the AI client to generate code for a requirement."""
+        self.logger.info("Generating code for requirement %s", req_data.id)
+
+        # Create context for AI
+        context = self._build_ai_context(req_data, metadata)
+
+        # Generate code using AI
+        return self.ai_client.ask_question(
+            question=f"Generate Python code for this requirement: {req_data.description}\n\nContext:\n{context}",
+            system_prompt=self._get_code_generation_prompt(),
+            max_tokens=2000,
+        )
+
+    def _ask_for_code_changes(
+        self, req_data: RequirementData, metadata: Dict[str, Any]
+    ) -> tuple:
+        """
+        Request code for a requirement and parse a successful response.
+
+        Runs on the AI worker threads so parsing one response overlaps the
+        wait for the others.
+
+        Returns:
+            Tuple of (ai_response, changes); changes is empty unless the
+            request succeeded.
+        """
+        ai_response = self._ask_for_code(req_data, metadata)
+        if ai_response["status"] != "success":
+            return ai_response, []
+
+        changes = self._parse_generated_code(req_data, ai_response["answer"], metadata)
+        return ai_response, changes
+
     def _generate_code_for_requirement(
         self,
         req_data: RequirementData,
         metadata: Dict[str, Any],
         result: GenerationResult,
+        ai_request: Optional[Future] = None,
     ) -> List[CodeChange]:
         """Generate code changes for a single requirement."""
         changes = []
@@ -256,23 +468,17 @@ class CodeGenerator:
         try:
             if not self.ai_client:
                 self.logger.warning(
-                    f"No AI client available for requirement {req_data.id}"
+                    "No AI client available for requirement %s", req_data.id
                 )
                 req_data.mark_failed("AI client not available")
                 result.requirements_failed += 1
                 return changes
 
-            self.logger.info(f"Generating code for requirement {req_data.id}")
-
-            # Create context for AI
-            context = self._build_ai_context(req_data, metadata)
-
-            # Generate code using AI
-            ai_response = self.ai_client.ask_question(
-                question=f"Generate Python code for this requirement: {req_data.description}\n\nContext:\n{context}",
-                system_prompt=self._get_code_generation_prompt(),
-                max_tokens=2000,
-            )
+            # Use the result of an already submitted request if there is one
+            if ai_request is not None:
+                ai_response, changes = ai_request.result()
+            else:
+                ai_response, changes = self._ask_for_code_changes(req_data, metadata)
 
             if ai_response["status"] != "success":
                 req_data.mark_failed(
@@ -284,14 +490,13 @@ class CodeGenerator:
             generated_code = ai_response["answer"]
             result.ai_tokens_used += ai_response["usage"]["total_tokens"]
 
-            # Parse generated code and create changes
-            changes = self._parse_generated_code(req_data, generated_code, metadata)
-
             if changes:
                 req_data.mark_implemented(generated_code)
                 result.requirements_implemented += 1
                 self.logger.info(
-                    f"Generated {len(changes)} code changes for requirement {req_data.id}"
+                    "Generated %d code changes for requirement %s",
+                    len(changes),
+                    req_data.id,
                 )
             else:
                 req_data.mark_failed("No valid code changes generated")
@@ -313,13 +518,13 @@ class CodeGenerator:
         self, req_data: RequirementData, metadata: Dict[str, Any]
     ) -> str:
         """Build context information for AI code generation."""
-        context_parts = []
-
         # Add requirement details
-        context_parts.append(f"Requirement ID: {req_data.id}")
-        context_parts.append(f"Description: {req_data.description}")
-        context_parts.append(f"Complexity Score: {req_data.complexity_score}")
-        context_parts.append(f"Implementation Notes: {req_data.implementation_notes}")
+        context_parts = [
+            f"Requirement ID: {req_data.id}",
+            f"Description: {req_data.description}",
+            f"Complexity Score: {req_data.complexity_score}",
+            f"Implementation Notes: {req_data.implementation_notes}",
+        ]
 
         # Add target files information
         if req_data.target_files:
@@ -329,12 +534,18 @@ class CodeGenerator:
             for file_path in req_data.target_files[:2]:  # Limit to first 2 files
                 file_info = self._get_file_info_from_metadata(file_path, metadata)
                 if file_info:
-                    context_parts.append(f"\nFile: {file_path}")
-                    context_parts.append(
-                        f"Functions: {[f['name'] for f in file_info.get('functions', [])]}"
-                    )
-                    context_parts.append(
-                        f"Classes: {[c['name'] for c in file_info.get('classes', [])]}"
+                    context_parts.extend(
+                        (
+                            f"\nFile: {file_path}",
+                            "Functions: "
+                            + ", ".join(
+                                f["name"] for f in file_info.get("functions", ())
+                            ),
+                            "Classes: "
+                            + ", ".join(
+                                c["name"] for c in file_info.get("classes", ())
+                            ),
+                        )
                     )
 
         # Add dependencies
@@ -343,25 +554,37 @@ class CodeGenerator:
 
         # Add project structure overview
         if "files" in metadata:
-            file_list = [
-                f["path"]
-                for f in metadata["files"]
-                if not any(test in f["path"] for test in ["test", "__pycache__"])
-            ]
-            context_parts.append(
-                f"Project Files: {', '.join(file_list[:10])}"
-            )  # First 10 files
+            # Stop after the first 10 matching files instead of filtering them all
+            file_list = islice(
+                (
+                    f["path"]
+                    for f in metadata["files"]
+                    if "test" not in f["path"] and "__pycache__" not in f["path"]
+                ),
+                10,
+            )
+            context_parts.append("Project Files: " + ", ".join(file_list))
 
         return "\n".join(context_parts)
 
+    def _index_metadata_files(self, metadata: Dict[str, Any]) -> None:
+        """Index metadata file entries by path for constant-time lookups."""
+        file_index = {}
+        for file_info in metadata.get("files", []):
+            # Keep the first entry for a path, as the previous linear scan did
+            file_index.setdefault(file_info.get("path"), file_info)
+
+        self._indexed_metadata = metadata
+        self._file_index = file_index
+        self._imports_by_file = {}
+
     def _get_file_info_from_metadata(
         self, file_path: str, metadata: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """Get file information from metadata."""
-        for file_info in metadata.get("files", []):
-            if file_info.get("path") == file_path:
-                return file_info
-        return None
+        if metadata is not self._indexed_metadata:
+            self._index_metadata_files(metadata)
+        return self._file_index.get(file_path)
 
     def _get_code_generation_prompt(self) -> str:
         """Get the system prompt for code generation."""
@@ -391,24 +614,11 @@ Focus on creating production-ready code that integrates well with existing codeb
 
         try:
             # Clean up the generated code
-            code_lines = generated_code.split("\n")
-            clean_lines = []
-            in_code_block = False
-
-            for line in code_lines:
-                if line.strip().startswith("```"):
-                    in_code_block = not in_code_block
-                    continue
-                if in_code_block or (
-                    not line.startswith("```") and "python" not in line.lower()
-                ):
-                    clean_lines.append(line)
-
-            clean_code = "\n".join(clean_lines).strip()
+            clean_code = self._clean_generated_code(generated_code)
 
             if not clean_code:
                 self.logger.warning(
-                    f"No clean code generated for requirement {req_data.id}"
+                    "No clean code generated for requirement %s", req_data.id
                 )
                 return changes
 
@@ -448,7 +658,7 @@ Focus on creating production-ready code that integrates well with existing codeb
                 changes.append(change)
             else:
                 # Create new file
-                new_file = f"{req_data.id.lower().replace(' ', '_')}.py"
+                new_file = f"{req_data.slug}.py"
                 change = CodeChange(
                     change_type=ChangeType.CREATE_FILE,
                     file_path=new_file,
@@ -460,9 +670,13 @@ Focus on creating production-ready code that integrates well with existing codeb
 
             # Check for import requirements
             imports = self._extract_required_imports(clean_code)
-            for target_file in req_data.target_files or [
-                changes[0].file_path if changes else ""
-            ]:
+
+            # Check each distinct target once; an empty path cannot take imports
+            targets = dict.fromkeys(
+                req_data.target_files or [change.file_path for change in changes[:1]]
+            )
+            targets.pop("", None)
+            for target_file in targets if imports else ():
                 for import_stmt in imports:
                     if not self._import_exists_in_file(
                         target_file, import_stmt, metadata
@@ -480,7 +694,7 @@ Focus on creating production-ready code that integrates well with existing codeb
 
         except Exception as e:
             self.logger.error(
-                f"Failed to parse generated code for {req_data.id}: {str(e)}"
+                "Failed to parse generated code for %s: %s", req_data.id, e
             )
             return []
 
@@ -501,29 +715,20 @@ Focus on creating production-ready code that integrates well with existing codeb
         """Extract import statements that might be needed for the code."""
         imports = []
 
-        # Common patterns that suggest imports
-        import_patterns = {
-            "typing": ["List", "Dict", "Optional", "Any", "Union"],
-            "datetime": ["datetime", "date", "time"],
-            "json": ["json."],
-            "os": ["os.path", "os."],
-            "sys": ["sys."],
-            "pathlib": ["Path"],
-            "logging": ["logging."],
-            "argparse": ["ArgumentParser", "argparse"],
-        }
-
-        for module, patterns in import_patterns.items():
-            if any(pattern in code for pattern in patterns):
-                if module == "typing":
-                    # Extract specific typing imports
-                    typing_imports = [p for p in patterns if p in code]
-                    if typing_imports:
-                        imports.append(
-                            f"from typing import {', '.join(typing_imports)}"
-                        )
-                else:
-                    imports.append(f"import {module}")
+        # Scan the code once for every pattern, then map hits back to modules
+        hits = set(_IMPORT_PATTERN_RE.findall(code))
+        if not hits:
+            return imports
+
+        for module, patterns in IMPORT_PATTERNS.items():
+            if hits.isdisjoint(patterns):
+                continue
+            if module == "typing":
+                # Extract specific typing imports
+                typing_imports = ", ".join(p for p in patterns if p in hits)
+                imports.append(f"from typing import {typing_imports}")
+            else:
+                imports.append(f"import {module}")
 
         return imports
 
@@ -531,11 +736,16 @@ Focus on creating production-ready code that integrates well with existing codeb
         self, file_path: str, import_stmt: str, metadata: Dict[str, Any]
     ) -> bool:
         """Check if import already exists in file."""
-        file_info = self._get_file_info_from_metadata(file_path, metadata)
-        if not file_info:
-            return False
+        if metadata is not self._indexed_metadata:
+            self._index_metadata_files(metadata)
+
+        # Deduplicate each file's imports once, on first lookup
+        existing_imports = self._imports_by_file.get(file_path)
+        if existing_imports is None:
+            file_info = self._file_index.get(file_path) or {}
+            existing_imports = frozenset(file_info.get("imports", ()))
+            self._imports_by_file[file_path] = existing_imports
 
-        existing_imports = file_info.get("imports", [])
         return any(imp in import_stmt for imp in existing_imports)
 
     def _generate_and_apply_tests(
@@ -549,14 +759,43 @@ Focus on creating production-ready code that integrates well with existing codeb
             self.logger.warning("No AI client available for test generation")
             return
 
-        for req_data in requirement_objects:
-            if req_data.status != RequirementStatus.IMPLEMENTED:
-                continue
+        implemented = [
+            req_data
+            for req_data in requirement_objects
+            if req_data.status == RequirementStatus.IMPLEMENTED
+        ]
+        if not implemented:
+            return
 
-            try:
-                self.logger.info(f"Generating tests for requirement {req_data.id}")
+        tested = []
+        with ThreadPoolExecutor(max_workers=self.AI_MAX_WORKERS) as executor:
+            # Request all test suites concurrently, then collect them in order
+            ai_requests = [
+                executor.submit(self._ask_for_tests, req_data)
+                for req_data in implemented
+            ]
+            for req_data, ai_request in zip(implemented, ai_requests):
+                test_change = self._build_test_change(req_data, ai_request, result)
+                if test_change:
+                    tested.append((req_data, test_change))
+
+        if not tested:
+            return
 
-                test_prompt = f"""Generate pytest test cases for this requirement:
+        # Write every test file in a single integrator pass
+        self.integrator.apply_code_changes(
+            [test_change for _, test_change in tested], output_path, result
+        )
+        for req_data, test_change in tested:
+            if test_change.applied:
+                req_data.test_code = test_change.content
+                self.logger.info("Generated tests for requirement %s", req_data.id)
+
+    def _ask_for_tests(self, req_data: RequirementData) -> Dict[str, Any]:
+        """Ask the AI client to generate test cases for a requirement."""
+        self.logger.info("Generating tests for requirement %s", req_data.id)
+
+        test_prompt = f"""Generate pytest test cases for this requirement:
                 
 Requirement: {req_data.description}
 Generated Code: {req_data.generated_code}
@@ -568,61 +807,57 @@ Generate comprehensive test cases that:
 3. Test error conditions
 4. Include proper imports and setup"""
 
-                ai_response = self.ai_client.ask_question(
-                    question=test_prompt,
-                    system_prompt="You are an expert at writing Python test cases using pytest. Generate clean, comprehensive test code.",
-                    max_tokens=1500,
-                )
-
-                if ai_response["status"] == "success":
-                    test_code = ai_response["answer"]
-                    result.ai_tokens_used += ai_response["usage"]["total_tokens"]
+        return self.ai_client.ask_question(
+            question=test_prompt,
+            system_prompt="You are an expert at writing Python test cases using pytest. Generate clean, comprehensive test code.",
+            max_tokens=1500,
+        )
 
-                    # Clean and save test code
-                    test_code = self._clean_generated_code(test_code)
-                    test_file = f"test_{req_data.id.lower().replace(' ', '_')}.py"
+    def _build_test_change(
+        self, req_data: RequirementData, ai_request: Future, result: GenerationResult
+    ) -> Optional[CodeChange]:
+        """Turn the test cases returned for a requirement into a code change."""
+        try:
+            ai_response = ai_request.result()
 
-                    test_change = CodeChange(
-                        change_type=ChangeType.CREATE_TEST,
-                        file_path=test_file,
-                        content=test_code,
-                        requirement_id=req_data.id,
-                        description=f"Test cases for requirement {req_data.id}",
-                    )
+            if ai_response["status"] == "success":
+                test_code = ai_response["answer"]
+                result.ai_tokens_used += ai_response["usage"]["total_tokens"]
 
-                    if self.integrator.apply_code_changes(
-                        [test_change], output_path, result
-                    ):
-                        req_data.test_code = test_code
-                        self.logger.info(
-                            f"Generated tests for requirement {req_data.id}"
-                        )
+                # Clean and save test code
+                test_code = self._clean_generated_code(test_code)
+                test_file = f"test_{req_data.slug}.py"
 
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to generate tests for {req_data.id}: {str(e)}"
-                )
-                result.add_problem(
-                    "warning",
-                    "testing",
-                    f"Test generation failed for {req_data.id}: {str(e)}",
+                return CodeChange(
+                    change_type=ChangeType.CREATE_TEST,
+                    file_path=test_file,
+                    content=test_code,
                     requirement_id=req_data.id,
+                    description=f"Test cases for requirement {req_data.id}",
                 )
 
+        except Exception as e:
+            self.logger.error("Failed to generate tests for %s: %s", req_data.id, e)
+            result.add_problem(
+                "warning",
+                "testing",
+                f"Test generation failed for {req_data.id}: {str(e)}",
+                requirement_id=req_data.id,
+            )
+
+        return None
+
     def _clean_generated_code(self, code: str) -> str:
         """Clean generated code by removing markdown and extra text."""
-        lines = code.split("\n")
-        clean_lines = []
-        in_code_block = False
-
-        for line in lines:
-            if line.strip().startswith("```"):
-                in_code_block = not in_code_block
-                continue
-            if in_code_block or not line.strip().startswith("```"):
-                clean_lines.append(line)
+        # Most responses carry no fences at all; skip the regex for them
+        if "```" not in code:
+            return code.strip()
 
-        return "\n".join(clean_lines).strip()
+        # Keep only fenced code when the response uses markdown fences
+        blocks = _FENCE_RE.findall(code)
+        if blocks:
+            return "\n\n".join(block.strip("\n") for block in blocks).strip()
+        return code.strip()
 
     def _update_metadata(
         self, output_path: str, metadata_path: str, result: GenerationResult
@@ -631,7 +866,9 @@ Generate comprehensive test cases that:
         try:
             self.logger.info("Updating metadata for generated code")
 
-            # Run metadata generation on output
+            # Run metadata generation on output. This stays a subprocess: the
+            # metadata generator imports top-level "core" and "utils" packages
+            # that would clash with this package's own in the same interpreter.
             metadata_cmd = [
                 sys.executable,
                 str(
@@ -639,12 +876,8 @@ Generate comprehensive test cases that:
                     / "GenerateMetadataFromCode"
                     / "main.py"
                 ),
-                "--project-path",
                 output_path,
-                "--output-path",
                 str(Path(metadata_path).parent),
-                "--format",
-                "json",
             ]
 
             subprocess.run(metadata_cmd, check=True, capture_output=True, text=True)
@@ -652,41 +885,42 @@ Generate comprehensive test cases that:
             self.logger.info("Metadata updated successfully")
 
         except Exception as e:
-            self.logger.error(f"Failed to update metadata: {str(e)}")
+            self.logger.error("Failed to update metadata: %s", e)
             result.add_problem(
                 "warning", "metadata", f"Metadata update failed: {str(e)}"
             )
 
-    def _run_validation(self, output_path: str, result: GenerationResult):
+    def _run_validation(
+        self, output_path: str, metadata_path: str, result: GenerationResult
+    ):
         """Run validation on the generated code."""
         try:
             self.logger.info("Running validation on generated code")
 
-            # Run validation system
-            validation_cmd = [
-                sys.executable,
-                str(Path(__file__).parent.parent.parent / "ValidationUnit" / "main.py"),
-                "--project-path",
-                output_path,
-                "--format",
-                "json",
-            ]
+            if CodebaseValidator is None:
+                result.add_problem(
+                    "warning", "validation", "Validation unit not available"
+                )
+                self.logger.warning("Validation unit not available")
+                return
 
-            validation_result = subprocess.run(
-                validation_cmd, check=False, capture_output=True, text=True
-            )
+            # Run validation system in-process, logging through our logger
+            # so the host's logging configuration is left alone
+            validator = CodebaseValidator(ValidationConfig(), logger=self.logger)
+            validation_result = validator.validate_codebase(output_path, metadata_path)
 
-            if validation_result.returncode == 0:
+            if validation_result.is_valid:
                 result.validation_passed = True
                 self.logger.info("Validation passed")
             else:
                 result.add_problem(
                     "warning",
                     "validation",
-                    f"Validation failed: {validation_result.stderr}",
+                    f"Validation failed with "
+                    f"{validation_result.total_error_count()} errors",
                 )
                 self.logger.warning("Validation failed")
 
         except Exception as e:
-            self.logger.error(f"Failed to run validation: {str(e)}")
+            self.logger.error("Failed to run validation: %s", e)
             result.add_problem("warning", "validation", f"Validation error: {str(e)}")
@@ -3,26 +3,153 @@ Code integrator for applying generated code changes to existing codebases.
 """
 
 import os
+import re
 import ast
+import copy
 import shutil
+import hashlib
+import json
+import mmap
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from typing import List, Dict, NamedTuple, Optional
 from pathlib import Path
 
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from models.code_change import CodeChange, ChangeType
-from models.requirement_data import RequirementData
 from models.generation_result import GenerationResult
 
+# Parse summaries kept between runs, in the user's cache directory by default
+DEFAULT_SUMMARY_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"))
+    / "GenerateCodeFromRequirements"
+    / "ast_summaries.json"
+)
+
+
+class _ClassSpan(NamedTuple):
+    """Location of a class definition, as needed to add a method to it."""
+
+    lineno: int
+    end_lineno: int
+    col_offset: int
+    body_lineno: int
+    body_col_offset: int
+    is_last: bool  # last top-level statement of the module
+
+
+class _FileUpdate(NamedTuple):
+    """Outcome of applying changes to one file, before it is written."""
+
+    target_file: Path
+    content: Optional[str]  # None when the file is left untouched
+    applied: List[CodeChange]
+    created: bool
+    modified: bool
+
+
+# The module header as a whole: any number of key lines (shebang or encoding
+# comments, docstrings, and imports with parenthesised or backslash-continued
+# name lists), each optionally preceded by blank or other comment lines. The
+# match ends just past the last key line, where a new import belongs.
+_MODULE_HEADER_RE = re.compile(
+    r"""
+    (?:
+        (?:[ \t\f]*(?:\#(?!!)(?:(?!coding)[^\r\n])*)?(?:\r\n|\n|\r))*
+        (?:
+            [ \t\f]*\#(?:!|(?=[^\r\n]*coding))[^\r\n]*
+        |
+            (?:[rRuUbBfF]{0,2}
+                (?:\"\"\"(?:[^"\\]|\\[\s\S]|"(?!""))*\"\"\"
+                | '''(?:[^'\\]|\\[\s\S]|'(?!''))*'''
+                | "(?:[^"\\\r\n]|\\[\s\S])*"
+                | '(?:[^'\\\r\n]|\\[\s\S])*'
+                )[ \t]*
+            )+
+            (?:\#[^\r\n]*)?
+        |
+            (?:import|from)\b
+            (?:[^\r\n\\(\#]|\\\r?\n|\\\r|\((?:[^)\#]|\#[^\r\n]*(?![^\r\n]))*\))*
+            (?:\#[^\r\n]*)?
+        )
+        (?:\r\n|\n|\r|\Z)
+    )*
+    """,
+    re.VERBOSE,
+)
+
+# Matches from the end of the header if the next statement is neither an
+# import nor something a docstring could start with
+_STATEMENT_START_RE = re.compile(
+    r"(?:\s|\#[^\r\n]*(?![^\r\n]))*"
+    r"(?=[A-Za-z_@])(?!(?:import|from)\b|[rRuUbBfF]{1,2}['\"])"
+)
+
 
 class CodeIntegrator:
     """Integrates generated code into existing codebase."""
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
-        """Initialize the integrator."""
+    # Maximum number of parsed module trees kept, keyed by content hash
+    AST_CACHE_SIZE = 128
+
+    # Maximum number of parse summaries kept, in memory and on disk
+    SUMMARY_CACHE_SIZE = 4096
+    # Bumped when what a summary records changes, so older caches are ignored
+    SUMMARY_CACHE_VERSION = 2
+
+    # Maximum number of files changed concurrently
+    APPLY_MAX_WORKERS = 8
+
+    # Directory entries never copied into the output directory
+    COPY_SKIP_NAMES = frozenset({"__pycache__", ".git"})
+    COPY_SKIP_SUFFIXES = (".pyc",)
+
+    # Files at least this large are copied with copy_file_range where available
+    KERNEL_COPY_THRESHOLD = 1 << 20
+
+    # Files at least this large are read through a memory map
+    MMAP_READ_THRESHOLD = 64 * 1024
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        sync_writes: bool = False,
+        summary_cache_path: Optional[str] = None,
+    ):
+        """
+        Initialize the integrator.
+
+        Args:
+            logger: Logger to report progress to
+            sync_writes: Flush written files to disk at the end of each batch
+            summary_cache_path: File parse summaries are kept in between runs,
+                defaulting to one in the user's cache directory
+        """
         self.logger = logger or logging.getLogger(__name__)
+        self.sync_writes = sync_writes
+        self.summary_cache_path = (
+            Path(summary_cache_path)
+            if summary_cache_path
+            else DEFAULT_SUMMARY_CACHE_PATH
+        )
+
+        # LRU cache of parsed trees so repeated changes to a file parse it once
+        self._ast_cache: "OrderedDict[bytes, ast.Module]" = OrderedDict()
+
+        # LRU cache of parse summaries keyed by hex content hash, persisted
+        self._summaries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._summaries_path: Optional[Path] = None
+        self._summaries_dirty = False
+
+        self._cache_lock = threading.Lock()
+
+        # Directories known to exist, so each is created at most once
+        self._created_dirs: set = set()
 
     def prepare_output_directory(self, source_path: str, output_path: str) -> bool:
         """
@@ -49,11 +176,8 @@ class CodeIntegrator:
                 # Copy entire directory structure
                 if output_path.exists():
                     shutil.rmtree(output_path)
-                shutil.copytree(
-                    source_path,
-                    output_path,
-                    ignore=shutil.ignore_patterns("__pycache__", "*.pyc", ".git"),
-                )
+                    self._created_dirs.clear()
+                self._copy_tree(source_path, output_path)
 
             self.logger.info(f"Source code copied from {source_path} to {output_path}")
             return True
@@ -62,12 +186,59 @@ class CodeIntegrator:
             self.logger.error(f"Failed to prepare output directory: {str(e)}")
             return False
 
+    def _copy_tree(self, source: Path, destination: Path):
+        """Recursively copy a directory, skipping caches and VCS data."""
+        os.makedirs(destination)
+
+        with os.scandir(source) as entries:
+            for entry in entries:
+                name = entry.name
+                if name in self.COPY_SKIP_NAMES or name.endswith(
+                    self.COPY_SKIP_SUFFIXES
+                ):
+                    continue
+
+                target = os.path.join(destination, name)
+                if entry.is_dir():
+                    self._copy_tree(entry.path, target)
+                else:
+                    self._copy_file(entry.path, target, entry.stat().st_size)
+
+        shutil.copystat(source, destination)
+
+    def _copy_file(self, source: str, target: str, size: int):
+        """Copy a file's data and metadata, in the kernel for large files."""
+        if size >= self.KERNEL_COPY_THRESHOLD and hasattr(os, "copy_file_range"):
+            try:
+                self._copy_file_range(source, target)
+            except OSError:
+                # Unsupported by the filesystem; sendfile-based copy instead
+                shutil.copyfile(source, target)
+        else:
+            shutil.copyfile(source, target)
+
+        shutil.copystat(source, target)
+
+    @staticmethod
+    def _copy_file_range(source: str, target: str):
+        """Copy file data with copy_file_range (reflink/server-side capable)."""
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            while os.copy_file_range(
+                src.fileno(), dst.fileno(), CodeIntegrator.KERNEL_COPY_THRESHOLD
+            ):
+                pass
+
     def apply_code_changes(
         self, changes: List[CodeChange], output_path: str, result: GenerationResult
     ) -> bool:
         """
         Apply a list of code changes to the output directory.
 
+        Changes are grouped by target file and applied in memory, so each
+        file is read and written at most once regardless of how many
+        changes it receives. Distinct files are processed concurrently and
+        written together once all of them are done.
+
         Args:
             changes: List of code changes to apply
             output_path: Path to output directory
@@ -77,376 +248,769 @@ class CodeIntegrator:
             True if all changes applied successfully, False otherwise
         """
         output_path = Path(output_path)
-        success_count = 0
 
         self.logger.info(f"Applying {len(changes)} code changes")
 
+        # Group changes by target file, keeping their relative order
+        groups: Dict[Path, List[CodeChange]] = defaultdict(list)
         for change in changes:
-            try:
-                if self._apply_single_change(change, output_path, result):
-                    change.mark_applied()
-                    success_count += 1
-                    self.logger.debug(
-                        f"Applied change: {change.change_type.value} to {change.file_path}"
-                    )
-                else:
-                    change.mark_failed("Failed to apply change")
-                    result.add_problem(
-                        "error",
-                        "integration",
-                        f"Failed to apply {change.change_type.value} to {change.file_path}",
-                        file_path=change.file_path,
-                        requirement_id=change.requirement_id,
-                    )
+            groups[self._target_path(change, output_path)].append(change)
+
+        self._load_summaries(self.summary_cache_path)
+
+        # Each file records into its own result, merged back in group order
+        file_results = [GenerationResult(status=result.status) for _ in groups]
+        max_workers = min(self.APPLY_MAX_WORKERS, len(groups)) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            updates = list(
+                executor.map(
+                    self._apply_file_changes,
+                    groups.keys(),
+                    groups.values(),
+                    file_results,
+                )
+            )
+
+        success_count = self._write_updates(updates, file_results)
+        self._merge_file_results(result, file_results)
+        self._store_summaries(self.summary_cache_path)
+
+        self.logger.info(f"Applied {success_count}/{len(changes)} changes successfully")
+        return success_count == len(changes)
+
+    def _target_path(self, change: CodeChange, output_path: Path) -> Path:
+        """Resolve the file a change is written to."""
+        target_file = output_path / change.file_path
+
+        # Ensure test file is in tests directory
+        if change.change_type == ChangeType.CREATE_TEST and "test" not in str(
+            target_file
+        ):
+            return target_file.parent / "tests" / f"test_{target_file.name}"
+
+        return target_file
+
+    def _apply_file_changes(
+        self, target_file: Path, changes: List[CodeChange], result: GenerationResult
+    ) -> Optional[_FileUpdate]:
+        """
+        Apply all changes targeting one file in memory.
+
+        Args:
+            target_file: File the changes are applied to
+            changes: Changes for this file, in application order
+            result: Generation result to record failures in
 
+        Returns:
+            The file's final content and applied changes, or None if no
+            change could be applied
+        """
+        try:
+            if self._needs_existing_content(changes):
+                content = self._read_file(target_file)
+            else:
+                # Replaced before anything reads it; only existence matters
+                content = "" if target_file.exists() else None
+        except Exception as e:
+            self.logger.error(f"Failed to read {target_file}: {str(e)}")
+            for change in changes:
+                self._fail_change(change, f"Error applying change: {str(e)}", result)
+            return None
+
+        applied = []
+        created = modified = False
+
+        for change in changes:
+            try:
+                new_content = self._apply_single_change(change, target_file, content)
             except Exception as e:
-                error_msg = f"Error applying change: {str(e)}"
-                change.mark_failed(error_msg)
-                result.add_problem(
-                    "error",
-                    "integration",
-                    error_msg,
-                    file_path=change.file_path,
-                    requirement_id=change.requirement_id,
-                )
+                self._fail_change(change, f"Error applying change: {str(e)}", result)
                 self.logger.error(
                     f"Error applying change to {change.file_path}: {str(e)}"
                 )
+                continue
 
-        self.logger.info(f"Applied {success_count}/{len(changes)} changes successfully")
-        return success_count == len(changes)
+            if new_content is None:
+                self._fail_change(
+                    change,
+                    "Failed to apply change",
+                    result,
+                    f"Failed to apply {change.change_type.value} to {change.file_path}",
+                )
+                continue
+
+            if content is None or change.change_type in (
+                ChangeType.CREATE_FILE,
+                ChangeType.CREATE_TEST,
+            ):
+                created = True
+            elif new_content is not content:
+                modified = True
+
+            content = new_content
+            applied.append(change)
+
+        if not applied:
+            return None
+
+        return _FileUpdate(
+            target_file,
+            content if created or modified else None,
+            applied,
+            created,
+            modified,
+        )
+
+    def _write_updates(
+        self,
+        updates: List[Optional[_FileUpdate]],
+        file_results: List[GenerationResult],
+    ) -> int:
+        """
+        Write all updated files in one pass and record their outcome.
+
+        Files are written grouped by directory. A file that cannot be written
+        fails all of its changes; the others are recorded as applied.
+
+        Returns:
+            Number of changes applied successfully
+        """
+        pending = sorted(
+            (
+                (update, file_result)
+                for update, file_result in zip(updates, file_results)
+                if update is not None
+            ),
+            key=lambda item: item[0].target_file.parent,
+        )
+
+        success_count = 0
+        written_dirs = set()
+
+        for update, file_result in pending:
+            if update.content is not None:
+                try:
+                    self._write_file(update.target_file, update.content)
+                except Exception as e:
+                    self.logger.error(f"Failed to write {update.target_file}: {str(e)}")
+                    for change in update.applied:
+                        self._fail_change(
+                            change, f"Error applying change: {str(e)}", file_result
+                        )
+                    continue
+                written_dirs.add(update.target_file.parent)
+
+            self._record_update(update, file_result)
+            success_count += len(update.applied)
+
+        if self.sync_writes:
+            self._sync_directories(written_dirs)
+
+        return success_count
+
+    def _record_update(self, update: _FileUpdate, result: GenerationResult):
+        """Record a written file and mark its changes applied."""
+        target = str(update.target_file)
+
+        # One entry per list at most, since the result covers a single file
+        if update.created:
+            result.files_created.append(target)
+        if update.modified:
+            result.files_modified.append(target)
+        if any(
+            change.change_type == ChangeType.CREATE_TEST for change in update.applied
+        ):
+            result.tests_generated.append(target)
+
+        for change in update.applied:
+            change.mark_applied()
+            self.logger.debug(
+                f"Applied change: {change.change_type.value} to {change.file_path}"
+            )
+
+    @staticmethod
+    def _merge_file_results(
+        result: GenerationResult, file_results: List[GenerationResult]
+    ):
+        """Merge the outcome of each file's changes into the overall result."""
+        # Sets mirror the de-duplicated lists for constant-time membership
+        modified = set(result.files_modified)
+        tests = set(result.tests_generated)
+
+        for file_result in file_results:
+            result.files_created.extend(file_result.files_created)
+            for path in file_result.files_modified:
+                if path not in modified:
+                    modified.add(path)
+                    result.files_modified.append(path)
+            for path in file_result.tests_generated:
+                if path not in tests:
+                    tests.add(path)
+                    result.tests_generated.append(path)
+            result.problems.extend(file_result.problems)
+
+    @staticmethod
+    def _needs_existing_content(changes: List[CodeChange]) -> bool:
+        """Check if a change reads the file before one replaces it."""
+        for change in changes:
+            if change.change_type in (
+                ChangeType.CREATE_FILE,
+                ChangeType.CREATE_TEST,
+                ChangeType.MODIFY_FILE,
+            ):
+                return False
+            if change.change_type in (
+                ChangeType.ADD_FUNCTION,
+                ChangeType.ADD_CLASS,
+                ChangeType.ADD_METHOD,
+                ChangeType.ADD_IMPORT,
+            ):
+                return True
+        return False
+
+    def _fail_change(
+        self,
+        change: CodeChange,
+        error_msg: str,
+        result: GenerationResult,
+        problem_msg: Optional[str] = None,
+    ):
+        """Mark a change as failed and record the problem."""
+        change.mark_failed(error_msg)
+        result.add_problem(
+            "error",
+            "integration",
+            problem_msg or error_msg,
+            file_path=change.file_path,
+            requirement_id=change.requirement_id,
+        )
+
+    def _read_file(self, file_path: Path) -> Optional[str]:
+        """Read a file's content, or None if it does not exist."""
+        try:
+            size = file_path.stat().st_size
+        except FileNotFoundError:
+            return None
+
+        if size >= self.MMAP_READ_THRESHOLD:
+            return self._read_mapped(file_path)
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    @staticmethod
+    def _read_mapped(file_path: Path) -> str:
+        """Decode a file straight from a read-only memory map."""
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                content = str(mapped, "utf-8")
+        finally:
+            os.close(fd)
+
+        # Translate newlines the same way text-mode reads do
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content
+
+    def _write_file(self, file_path: Path, content: str):
+        """Write content to a file, creating parent directories as needed."""
+        parent = file_path.parent
+        if parent not in self._created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(parent)
+
+        # Encode once and write the bytes directly, bypassing text buffering
+        data = memoryview(content.encode("utf-8"))
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+            if self.sync_writes:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _sync_directories(directories):
+        """Flush the entries of written files to disk, where supported."""
+        for directory in directories:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
 
     def _apply_single_change(
-        self, change: CodeChange, output_path: Path, result: GenerationResult
-    ) -> bool:
-        """Apply a single code change."""
-        target_file = output_path / change.file_path
+        self, change: CodeChange, target_file: Path, content: Optional[str]
+    ) -> Optional[str]:
+        """
+        Apply a single code change to in-memory file content.
+
+        Args:
+            change: Change to apply
+            target_file: File the change targets, used for messages
+            content: Current file content, or None if the file does not exist
 
-        if change.change_type == ChangeType.CREATE_FILE:
-            return self._create_file(target_file, change.content, result)
+        Returns:
+            New file content, or None if the change could not be applied
+        """
+        if change.change_type in (ChangeType.CREATE_FILE, ChangeType.CREATE_TEST):
+            return change.content
 
         elif change.change_type == ChangeType.MODIFY_FILE:
-            return self._modify_file(target_file, change.content, result)
+            return self._modify_file(target_file, content, change.content)
 
         elif change.change_type == ChangeType.ADD_FUNCTION:
-            return self._add_function_to_file(target_file, change, result)
+            return self._add_function_to_file(target_file, content, change)
 
         elif change.change_type == ChangeType.ADD_CLASS:
-            return self._add_class_to_file(target_file, change, result)
+            return self._add_class_to_file(target_file, content, change)
 
         elif change.change_type == ChangeType.ADD_METHOD:
-            return self._add_method_to_class(target_file, change, result)
+            return self._add_method_to_class(target_file, content, change)
 
         elif change.change_type == ChangeType.ADD_IMPORT:
-            return self._add_import_to_file(target_file, change.content, result)
-
-        elif change.change_type == ChangeType.CREATE_TEST:
-            return self._create_test_file(target_file, change.content, result)
+            return self._add_import_to_file(target_file, content, change.content)
 
         else:
             self.logger.error(f"Unknown change type: {change.change_type}")
-            return False
-
-    def _create_file(
-        self, file_path: Path, content: str, result: GenerationResult
-    ) -> bool:
-        """Create a new file with the given content."""
-        try:
-            # Create directory if it doesn't exist
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Write content to file
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
-
-            result.files_created.append(str(file_path))
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to create file {file_path}: {str(e)}")
-            return False
+            return None
 
     def _modify_file(
-        self, file_path: Path, new_content: str, result: GenerationResult
-    ) -> bool:
+        self, file_path: Path, original_content: Optional[str], new_content: str
+    ) -> Optional[str]:
         """Replace entire file content."""
-        try:
-            if not file_path.exists():
-                self.logger.error(f"File {file_path} does not exist for modification")
-                return False
-
-            # Backup original content
-            with open(file_path, "r", encoding="utf-8") as f:
-                original_content = f.read()
-
-            # Write new content
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(new_content)
-
-            if str(file_path) not in result.files_modified:
-                result.files_modified.append(str(file_path))
-            return True
+        if original_content is None:
+            self.logger.error(f"File {file_path} does not exist for modification")
+            return None
 
-        except Exception as e:
-            self.logger.error(f"Failed to modify file {file_path}: {str(e)}")
-            return False
+        return new_content
 
     def _add_function_to_file(
-        self, file_path: Path, change: CodeChange, result: GenerationResult
-    ) -> bool:
+        self, file_path: Path, original_content: Optional[str], change: CodeChange
+    ) -> Optional[str]:
         """Add a function to an existing file."""
         try:
-            if not file_path.exists():
-                return self._create_file(file_path, change.content, result)
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                original_content = f.read()
+            if original_content is None:
+                return change.content
 
             # If file is empty or only has imports, add function directly
-            if not original_content.strip() or self._only_has_imports(original_content):
-                new_content = original_content + "\n\n" + change.content
-            else:
-                # Add function at the end of the file
-                new_content = original_content.rstrip() + "\n\n" + change.content + "\n"
-
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(new_content)
+            if (
+                not original_content
+                or original_content.isspace()
+                or self._only_has_imports(original_content)
+            ):
+                return self._append_code(original_content, change.content, tidy=False)
 
-            if str(file_path) not in result.files_modified:
-                result.files_modified.append(str(file_path))
-            return True
+            # Add function at the end of the file
+            return self._append_code(original_content, change.content)
 
         except Exception as e:
             self.logger.error(f"Failed to add function to {file_path}: {str(e)}")
-            return False
+            return None
 
     def _add_class_to_file(
-        self, file_path: Path, change: CodeChange, result: GenerationResult
-    ) -> bool:
+        self, file_path: Path, original_content: Optional[str], change: CodeChange
+    ) -> Optional[str]:
         """Add a class to an existing file."""
-        try:
-            if not file_path.exists():
-                return self._create_file(file_path, change.content, result)
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                original_content = f.read()
+        if original_content is None:
+            return change.content
 
-            # Add class at the end of the file
-            new_content = original_content.rstrip() + "\n\n" + change.content + "\n"
+        # Add class at the end of the file
+        return self._append_code(original_content, change.content)
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(new_content)
+    def _append_code(self, original_content: str, code: str, tidy: bool = True) -> str:
+        """
+        Append code after a blank line, keeping any cached tree in step.
 
-            if str(file_path) not in result.files_modified:
-                result.files_modified.append(str(file_path))
-            return True
+        With tidy, trailing whitespace is stripped from the content first and
+        a final newline is added after the code.
+        """
+        if tidy:
+            head = original_content.rstrip() + "\n\n"
+            new_content = head + code + "\n"
+        else:
+            head = original_content + "\n\n"
+            new_content = head + code
 
-        except Exception as e:
-            self.logger.error(f"Failed to add class to {file_path}: {str(e)}")
-            return False
+        self._extend_cached_tree(original_content, head, code, new_content)
+        return new_content
 
     def _add_method_to_class(
-        self, file_path: Path, change: CodeChange, result: GenerationResult
-    ) -> bool:
+        self, file_path: Path, original_content: Optional[str], change: CodeChange
+    ) -> Optional[str]:
         """Add a method to an existing class."""
         try:
-            if not file_path.exists():
+            if original_content is None:
                 self.logger.error(
                     f"File {file_path} does not exist for method addition"
                 )
-                return False
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                original_content = f.read()
+                return None
 
-            # Parse the AST to find the class
+            # Summarize the file to find the class
+            key = self._ast_key(original_content)
             try:
-                tree = ast.parse(original_content)
+                summary = self._summary(original_content, key)
             except SyntaxError as e:
                 self.logger.error(f"Syntax error in {file_path}: {str(e)}")
-                return False
+                return None
 
             # Find the target class
             target_class = change.target_class
             if not target_class:
                 self.logger.error("No target class specified for method addition")
-                return False
-
-            class_found = False
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef) and node.name == target_class:
-                    class_found = True
-                    break
-
-            if not class_found:
-                self.logger.error(f"Class {target_class} not found in {file_path}")
-                return False
-
-            # Simple approach: add method at the end of the class
-            # Find the last line of the class and insert before it
-            lines = original_content.split("\n")
-            class_indent = self._find_class_indent(lines, target_class)
+                return None
 
-            if class_indent is None:
-                self.logger.error(
-                    f"Could not determine indentation for class {target_class}"
+            span = summary["classes"].get(target_class)
+            if span is None:
+                # Only top-level classes are summarized; search nested ones
+                class_node = self._find_class_node(
+                    self._parse_cached(original_content, key), target_class
                 )
-                return False
+                if class_node is None:
+                    self.logger.error(f"Class {target_class} not found in {file_path}")
+                    return None
+                span = self._class_span(class_node, is_last=False)
+
+            # Indent like the class body, falling back to one level deeper
+            if span.body_lineno > span.lineno:
+                method_indent = span.body_col_offset
+            else:
+                method_indent = span.col_offset + 4
+
+            indent = " " * method_indent
+            indented_method = "\n".join(
+                indent + line if line and not line.isspace() else line
+                for line in change.content.split("\n")
+            )
 
-            # Find insertion point (end of class)
-            insertion_point = self._find_class_end(lines, target_class, class_indent)
-
-            # Add method with proper indentation
-            method_lines = change.content.split("\n")
-            indented_method = [
-                " " * (class_indent + 4) + line if line.strip() else line
-                for line in method_lines
-            ]
-
-            # Insert method
-            new_lines = (
-                lines[:insertion_point]
-                + [""]
-                + indented_method
-                + lines[insertion_point:]
+            # Splice the method in right after the last line of the class
+            line_ends = self._line_end_offsets(original_content)
+            offset = line_ends[span.end_lineno]
+            head = original_content[:offset]
+            if not head.endswith("\n"):
+                head += "\n"
+            new_content = (
+                head + "\n" + indented_method + "\n" + original_content[offset:]
             )
-            new_content = "\n".join(new_lines)
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(new_content)
+            # A method added to the last class extends its tree in place
+            tree = self._cached_tree(key)
+            if (
+                tree is not None
+                and span.is_last
+                and span.body_lineno > span.lineno
+                and original_content.startswith(
+                    " " * method_indent,
+                    line_ends[span.body_lineno - 1],
+                )
+            ):
+                self._extend_cached_class(tree, indented_method, new_content)
 
-            if str(file_path) not in result.files_modified:
-                result.files_modified.append(str(file_path))
-            return True
+            return new_content
 
         except Exception as e:
             self.logger.error(f"Failed to add method to class in {file_path}: {str(e)}")
-            return False
+            return None
 
     def _add_import_to_file(
-        self, file_path: Path, import_statement: str, result: GenerationResult
-    ) -> bool:
+        self,
+        file_path: Path,
+        original_content: Optional[str],
+        import_statement: str,
+    ) -> Optional[str]:
         """Add an import statement to a file."""
         try:
-            if not file_path.exists():
-                return self._create_file(file_path, import_statement + "\n", result)
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                original_content = f.read()
+            if original_content is None:
+                return import_statement + "\n"
 
             # Check if import already exists
             if import_statement.strip() in original_content:
-                return True  # Already exists
+                return original_content
 
-            lines = original_content.split("\n")
-
-            # Find the right place to insert the import
-            insertion_point = 0
-
-            # Skip shebang and encoding declarations
-            for i, line in enumerate(lines):
-                if line.startswith("#") and (
-                    "coding" in line or "encoding" in line or line.startswith("#!")
-                ):
-                    insertion_point = i + 1
-                elif line.strip().startswith('"""') or line.strip().startswith("'''"):
-                    # Skip docstrings
-                    quote = '"""' if line.strip().startswith('"""') else "'''"
-                    if line.count(quote) >= 2:
-                        insertion_point = i + 1
-                    else:
-                        # Multi-line docstring
-                        for j in range(i + 1, len(lines)):
-                            if quote in lines[j]:
-                                insertion_point = j + 1
-                                break
-                elif line.strip().startswith("import ") or line.strip().startswith(
-                    "from "
-                ):
-                    # Insert after existing imports
-                    insertion_point = i + 1
-                elif line.strip() and not line.startswith("#"):
-                    # First non-import, non-comment line
-                    break
-
-            # Insert import
-            new_lines = (
-                lines[:insertion_point] + [import_statement] + lines[insertion_point:]
-            )
-            new_content = "\n".join(new_lines)
-
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(new_content)
-
-            if str(file_path) not in result.files_modified:
-                result.files_modified.append(str(file_path))
-            return True
+            # Splice the import in after the module header
+            offset = self._import_insertion_offset(original_content)
+            head = original_content[:offset]
+            if head and not head.endswith("\n"):
+                head += "\n"
+            return head + import_statement + "\n" + original_content[offset:]
 
         except Exception as e:
             self.logger.error(f"Failed to add import to {file_path}: {str(e)}")
-            return False
-
-    def _create_test_file(
-        self, file_path: Path, content: str, result: GenerationResult
-    ) -> bool:
-        """Create a test file."""
-        try:
-            # Ensure test file is in tests directory
-            if "test" not in str(file_path):
-                test_dir = file_path.parent / "tests"
-                test_dir.mkdir(exist_ok=True)
-                file_path = test_dir / f"test_{file_path.name}"
+            return None
 
-            success = self._create_file(file_path, content, result)
-            if success and str(file_path) not in result.tests_generated:
-                result.tests_generated.append(str(file_path))
-            return success
+    def _import_insertion_offset(self, content: str) -> int:
+        """
+        Find the offset just past the module header: shebang and encoding
+        lines, the docstring and any leading imports.
 
-        except Exception as e:
-            self.logger.error(f"Failed to create test file {file_path}: {str(e)}")
-            return False
+        The whole header is matched by one precompiled pattern, so the scan
+        runs inside the regex engine without a Python-level loop.
+        """
+        return _MODULE_HEADER_RE.match(content).end()
 
     def _only_has_imports(self, content: str) -> bool:
         """Check if file only contains imports and comments."""
+        # Code right after the header settles it without parsing the file
+        if _STATEMENT_START_RE.match(content, _MODULE_HEADER_RE.match(content).end()):
+            return False
+
         try:
-            tree = ast.parse(content)
-            for node in tree.body:
-                if not isinstance(node, (ast.Import, ast.ImportFrom)):
-                    return False
-            return True
+            return self._summary(content)["only_imports"]
         except:
             return False
 
-    def _find_class_indent(self, lines: List[str], class_name: str) -> Optional[int]:
-        """Find the indentation level of a class."""
-        for line in lines:
-            if f"class {class_name}" in line and line.strip().startswith("class"):
-                return len(line) - len(line.lstrip())
-        return None
+    def _parse_cached(self, content: str, key: Optional[bytes] = None) -> ast.Module:
+        """Parse source content, reusing the tree for identical content."""
+        if key is None:
+            key = self._ast_key(content)
 
-    def _find_class_end(
-        self, lines: List[str], class_name: str, class_indent: int
-    ) -> int:
-        """Find the end of a class definition."""
-        class_start = -1
-
-        # Find class start
-        for i, line in enumerate(lines):
-            if f"class {class_name}" in line and line.strip().startswith("class"):
-                class_start = i
-                break
-
-        if class_start == -1:
-            return len(lines)
-
-        # Find class end (next class or function at same or lower indentation level)
-        for i in range(class_start + 1, len(lines)):
-            line = lines[i]
-            if line.strip() == "":
+        tree = self._cached_tree(key)
+        if tree is None:
+            tree = ast.parse(content)
+            self._store_tree(key, tree)
+
+        return tree
+
+    def _summary(self, content: str, key: Optional[bytes] = None) -> Dict:
+        """
+        Return the parse summary of source content: whether it only has
+        imports, and where its top-level classes are.
+
+        Summaries are small enough to persist between runs, so files seen
+        before are not parsed again just to answer these questions.
+        """
+        if key is None:
+            key = self._ast_key(content)
+        hex_key = key.hex()
+
+        with self._cache_lock:
+            summary = self._summaries.get(hex_key)
+            if summary is not None:
+                self._summaries.move_to_end(hex_key)
+                return summary
+
+        summary = self._summarize(self._parse_cached(content, key))
+        with self._cache_lock:
+            self._summaries[hex_key] = summary
+            self._summaries_dirty = True
+            if len(self._summaries) > self.SUMMARY_CACHE_SIZE:
+                self._summaries.popitem(last=False)
+
+        return summary
+
+    @classmethod
+    def _summarize(cls, tree: ast.Module) -> Dict:
+        """Build the parse summary of a module tree."""
+        body = tree.body
+
+        classes = {}
+        for node in body:
+            if isinstance(node, ast.ClassDef) and node.name not in classes:
+                classes[node.name] = cls._class_span(node, is_last=node is body[-1])
+
+        return {
+            "only_imports": all(
+                isinstance(node, (ast.Import, ast.ImportFrom)) for node in body
+            ),
+            "classes": classes,
+        }
+
+    @staticmethod
+    def _class_span(node: ast.ClassDef, is_last: bool) -> _ClassSpan:
+        """Return the location of a class definition."""
+        first_stmt = node.body[0]
+        return _ClassSpan(
+            node.lineno,
+            node.end_lineno,
+            node.col_offset,
+            first_stmt.lineno,
+            first_stmt.col_offset,
+            is_last,
+        )
+
+    def _load_summaries(self, cache_path: Path):
+        """Merge parse summaries persisted by earlier runs into memory."""
+        if cache_path == self._summaries_path:
+            return
+        self._summaries_path = cache_path
+
+        stored = self._read_summaries(cache_path)
+        with self._cache_lock:
+            for hex_key, summary in stored.items():
+                self._summaries.setdefault(hex_key, summary)
+
+    def _read_summaries(self, cache_path: Path) -> Dict[str, Dict]:
+        """Read persisted parse summaries; a missing or outdated file has none."""
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (
+            not isinstance(stored, dict)
+            or stored.get("version") != self.SUMMARY_CACHE_VERSION
+            or not isinstance(stored.get("summaries"), dict)
+        ):
+            return {}
+
+        summaries = {}
+        for hex_key, summary in stored["summaries"].items():
+            try:
+                summaries[hex_key] = {
+                    "only_imports": bool(summary["only_imports"]),
+                    "classes": {
+                        name: _ClassSpan(*span)
+                        for name, span in summary["classes"].items()
+                    },
+                }
+            except (KeyError, TypeError, AttributeError):
                 continue
+        return summaries
 
-            current_indent = len(line) - len(line.lstrip())
-            if current_indent <= class_indent and line.strip():
-                return i
+    def _store_summaries(self, cache_path: Path):
+        """
+        Persist parse summaries; failures only cost the next run a re-parse.
+
+        The cache file may be shared with concurrent runs, so summaries they
+        stored meanwhile are kept as the least recently used, and the file
+        is replaced atomically.
+        """
+        with self._cache_lock:
+            if not self._summaries_dirty:
+                return
+            self._summaries_dirty = False
+
+        on_disk = self._read_summaries(cache_path)
+        with self._cache_lock:
+            while len(self._summaries) > self.SUMMARY_CACHE_SIZE:
+                self._summaries.popitem(last=False)
+            summaries = {
+                hex_key: summary
+                for hex_key, summary in on_disk.items()
+                if hex_key not in self._summaries
+            }
+            summaries.update(self._summaries)
+        stored = {
+            "version": self.SUMMARY_CACHE_VERSION,
+            "summaries": dict(list(summaries.items())[-self.SUMMARY_CACHE_SIZE :]),
+        }
+
+        temp_path = cache_path.with_name(
+            f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(stored, f)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self.logger.debug(f"Could not write parse summary cache: {str(e)}")
+
+    @staticmethod
+    def _ast_key(content: str) -> bytes:
+        """Return the AST cache key for source content."""
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+    def _cached_tree(self, key: bytes) -> Optional[ast.Module]:
+        """Look up a parsed tree without parsing on a miss."""
+        with self._cache_lock:
+            tree = self._ast_cache.get(key)
+            if tree is not None:
+                self._ast_cache.move_to_end(key)
+            return tree
+
+    def _store_tree(self, key: bytes, tree: ast.Module):
+        """Add a parsed tree to the cache, evicting the oldest if full."""
+        with self._cache_lock:
+            self._ast_cache[key] = tree
+            if len(self._ast_cache) > self.AST_CACHE_SIZE:
+                self._ast_cache.popitem(last=False)
+
+    def _extend_cached_tree(
+        self, base_content: str, head: str, snippet: str, new_content: str
+    ):
+        """
+        Cache the tree of content made by appending a snippet to a file.
 
-        return len(lines)
+        If the file's tree is cached, only the snippet is parsed: its nodes
+        are moved down to where it was appended and added to the file's
+        top-level statements. Nothing follows them, so no existing node
+        needs to move and the result matches a full parse.
+        """
+        base_tree = self._cached_tree(self._ast_key(base_content))
+        if base_tree is None:
+            return
+
+        try:
+            snippet_tree = ast.parse(snippet)
+        except SyntaxError:
+            return
+
+        ast.increment_lineno(snippet_tree, head.count("\n"))
+        self._store_tree(
+            self._ast_key(new_content),
+            ast.Module(body=base_tree.body + snippet_tree.body, type_ignores=[]),
+        )
+
+    def _extend_cached_class(
+        self, tree: ast.Module, indented_method: str, new_content: str
+    ):
+        """
+        Cache the tree of content made by adding a method to the file's
+        last top-level class, by parsing just the method and appending it
+        to a copy of the class node.
+        """
+        class_node = tree.body[-1]
+
+        # Parse the method as indented in the file, under a dummy block
+        try:
+            block = ast.parse("if 1:\n" + indented_method).body[0]
+        except SyntaxError:
+            return
+
+        # The method starts two lines below the end of the class
+        for node in block.body:
+            ast.increment_lineno(node, class_node.end_lineno)
+
+        new_class = copy.copy(class_node)
+        new_class.body = class_node.body + block.body
+        new_class.end_lineno = block.body[-1].end_lineno
+        new_class.end_col_offset = block.body[-1].end_col_offset
+
+        self._store_tree(
+            self._ast_key(new_content),
+            ast.Module(body=tree.body[:-1] + [new_class], type_ignores=[]),
+        )
+
+    @staticmethod
+    def _find_class_node(tree: ast.Module, class_name: str) -> Optional[ast.ClassDef]:
+        """Find a class by name, checking top-level statements first."""
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and node.name == class_name:
+                return node
+
+        # Fall back to nested classes
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef) and node.name == class_name:
+                return node
+
+        return None
+
+    @staticmethod
+    def _line_end_offsets(content: str) -> List[int]:
+        """Return offsets just past each line, indexed by 1-based line number.
+
+        Entry 0 is the start of the content and the last entry is clamped
+        to its length, so AST line numbers index the table directly.
+        """
+        offsets = [0]
+        offsets.extend(accumulate(len(line) + 1 for line in content.split("\n")))
+        offsets[-1] = len(content)
+        return offsets
@@ -124,7 +124,7 @@ Examples:
         # Load configuration
         if args.config and Path(args.config).exists():
             config = GenerationConfig.load_from_file(args.config)
-            logger.info(f"Loaded configuration from {args.config}")
+            logger.info("Loaded configuration from %s", args.config)
         else:
             config = GenerationConfig()
             logger.info("Using default configuration")
@@ -146,25 +146,26 @@ Examples:
         if config_errors:
             logger.error("Configuration validation failed:")
             for error in config_errors:
-                logger.error(f"  - {error}")
+                logger.error("  - %s", error)
             sys.exit(1)
 
         # Validate input paths
         if not Path(args.project_path).exists():
-            logger.error(f"Project path does not exist: {args.project_path}")
+            logger.error("Project path does not exist: %s", args.project_path)
             sys.exit(1)
 
         if not Path(args.requirements).exists():
-            logger.error(f"Requirements file does not exist: {args.requirements}")
+            logger.error("Requirements file does not exist: %s", args.requirements)
             sys.exit(1)
 
         if not Path(args.metadata).exists():
-            logger.error(f"Metadata file does not exist: {args.metadata}")
+            logger.error("Metadata file does not exist: %s", args.metadata)
             sys.exit(1)
 
         if args.existing_requirements and not Path(args.existing_requirements).exists():
             logger.error(
-                f"Existing requirements file does not exist: {args.existing_requirements}"
+                "Existing requirements file does not exist: %s",
+                args.existing_requirements,
             )
             sys.exit(1)
 
@@ -172,7 +173,7 @@ Examples:
         if args.verbose:
             logger.info("Configuration summary:")
             for line in config.get_summary().split("\n"):
-                logger.info(f"  {line}")
+                logger.info("  %s", line)
 
         logger.info("Starting code generation process...")
         start_time = time.time()
@@ -220,9 +221,9 @@ Examples:
         if GenerationHelper.save_result_to_file(
             result.to_dict(), output_path, config.output_format
         ):
-            logger.info(f"Results saved to: {output_path}")
+            logger.info("Results saved to: %s", output_path)
         else:
-            logger.error(f"Failed to save results to: {output_path}")
+            logger.error("Failed to save results to: %s", output_path)
 
         # Exit with appropriate code
         if result.status == GenerationStatus.FAILED:
@@ -236,7 +237,7 @@ Examples:
         logger.info("Process interrupted by user")
         sys.exit(130)
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
         if args.verbose:
             import traceback
 
@@ -53,7 +53,23 @@ class SyntaxValidator:
             files_checked = 0
             syntax_errors = 0
 
-            for file_path in python_files:
+            # Check all files up front, possibly in parallel, and only
+            # re-parse the failures here to report their details
+            cache_path = (
+                self.config.syntax_cache_path
+                if self.config.syntax_cache_enabled
+                else None
+            )
+            syntax_results = ValidationHelper.check_python_syntax_batch(
+                python_files, cache_path
+            )
+
+            for file_path, (syntax_ok, _) in zip(python_files, syntax_results):
+                if syntax_ok:
+                    self.logger.debug(f"Syntax OK: {file_path}")
+                    files_checked += 1
+                    continue
+
                 try:
                     self._validate_file_syntax(file_path, result)
                     files_checked += 1